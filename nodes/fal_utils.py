@@ -1,29 +1,197 @@
 import configparser
+import hashlib
 import io
+import json
+import mimetypes
 import os
+import queue
+import shutil
+import subprocess
 import tempfile
 import threading
 import time
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from fractions import Fraction
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
 
 import numpy as np
 import requests
 from requests import HTTPError
 import torch
+import torch.nn.functional as F
 from fal_client.client import Completed, SyncClient
 from PIL import Image
 import cv2
 
+try:
+    import av
+except ImportError:  # PyAV is optional; an ffmpeg binary or OpenCV is used instead
+    av = None
+
 # Default timeouts/polling can be tuned via env vars when integrating in different environments
 _HTTP_TIMEOUT_SECONDS = float(os.getenv("FAL_HTTP_TIMEOUT", "30"))
 _JOB_TIMEOUT_SECONDS = float(os.getenv("FAL_JOB_TIMEOUT", "600"))
 _JOB_POLL_INTERVAL_SECONDS = float(os.getenv("FAL_JOB_POLL_INTERVAL", "0.25"))
 
+# Video encoding for uploads: encoder is one of auto, pyav, ffmpeg, opencv
+_VIDEO_ENCODER = os.getenv("FAL_VIDEO_ENCODER", "auto").strip().lower()
+_VIDEO_CRF = int(os.getenv("FAL_VIDEO_CRF", "20"))
+_VIDEO_PRESET = os.getenv("FAL_VIDEO_PRESET", "veryfast")
+
+# Multipart uploads: parts below 5 MB are rejected by the storage backend except for the last one
+_UPLOAD_CHUNK_BYTES = max(5, int(os.getenv("FAL_UPLOAD_CHUNK_MB", "10"))) * 1024 * 1024
+_UPLOAD_MAX_CONCURRENCY = int(os.getenv("FAL_UPLOAD_MAX_CONCURRENCY", "4"))
+_UPLOAD_PART_RETRIES = int(os.getenv("FAL_UPLOAD_PART_RETRIES", "3"))
+# Progress of large file uploads is recorded here so an interrupted upload can resume
+_UPLOAD_MANIFEST_DIR = os.getenv(
+    "FAL_UPLOAD_MANIFEST_DIR", os.path.join(tempfile.gettempdir(), "comfyui-fal-uploads")
+)
+# Multipart uploads that are not completed are discarded by the backend after a while
+_UPLOAD_RESUME_TTL_SECONDS = float(os.getenv("FAL_UPLOAD_RESUME_TTL_HOURS", "24")) * 3600
+_VIDEO_STREAM_UPLOAD = os.getenv("FAL_VIDEO_STREAM_UPLOAD", "0").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+}
+
+# Deterministic LLM/VLM responses are cached on disk so reruns skip the round trip
+_TEXT_CACHE_DIR = os.getenv(
+    "FAL_TEXT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "comfyui-fal-text-cache")
+)
+_TEXT_CACHE_MAX_BYTES = int(float(os.getenv("FAL_TEXT_CACHE_MAX_MB", "256")) * 1024**2)
+_TEXT_CACHE_VERSION = 1
+TEXT_CACHE_MODES = ["auto", "always", "never"]
+# Hedged text requests: delay before the backup model when no latency history exists yet
+_HEDGE_DEFAULT_DELAY_SECONDS = float(os.getenv("FAL_LLM_HEDGE_DELAY", "8"))
+_LATENCY_WINDOW = 50
+_LATENCY_MIN_SAMPLES = 5
+
+# Largest num_images each endpoint accepts per request; larger counts are split across requests
+_NUM_IMAGES_LIMITS = {
+    "fal-ai/flux-pro": 10,
+    "fal-ai/flux/dev": 10,
+    "fal-ai/flux/schnell": 10,
+    "fal-ai/flux-pro/v1.1": 10,
+    "fal-ai/flux-pro/v1.1-ultra": 1,
+    "fal-ai/flux-lora": 4,
+    "fal-ai/flux-general": 4,
+    "fal-ai/flux-pro/kontext": 4,
+    "fal-ai/flux-pro/kontext/multi": 4,
+    "fal-ai/flux-pro/kontext/text-to-image": 4,
+    "fal-ai/flux-pro/kontext/max": 4,
+    "fal-ai/flux-pro/kontext/max/multi": 4,
+    "fal-ai/flux-pro/kontext/max/text-to-image": 4,
+    "fal-ai/hidream-i1-full": 10,
+    "fal-ai/ideogram/v3": 10,
+    "fal-ai/nano-banana": 4,
+    "fal-ai/nano-banana/edit": 4,
+    "fal-ai/qwen-image": 4,
+    "fal-ai/qwen-image/image-to-image": 4,
+    "fal-ai/qwen-image-edit": 4,
+    "fal-ai/qwen-image-edit/inpaint": 4,
+    "fal-ai/qwen-image-edit-plus": 4,
+    "fal-ai/sana": 4,
+    "fal-ai/bytedance/seedream/v4/text-to-image": 4,
+    "fal-ai/bytedance/seedream/v4/edit": 4,
+}
+# Endpoints missing from the table are split at the smallest per-request cap any node had
+_DEFAULT_NUM_IMAGES_LIMIT = 4
+# Seeds derived for split requests stay in 1..2**31 - 1: the APIs take signed 32-bit seeds,
+# and several nodes treat 0 as "random"
+_SPLIT_SEED_MAX = 2**31 - 1
+_IMAGE_SPLIT_MAX_PARALLEL = int(os.getenv("FAL_IMAGE_SPLIT_MAX_PARALLEL", "4"))
+
 # Reuse a global session for media downloads to amortize TCP setup cost
 _HTTP_SESSION = requests.Session()
 
 
+def atomic_write(path: str, write: Callable[[Any], Any]) -> None:
+    """Call ``write`` on a binary temp file next to ``path``, then rename it into place.
+
+    Readers see either the previous file or the complete new one, never a partial write.
+    """
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            write(handle)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path: str, payload: Any) -> None:
+    atomic_write(path, lambda handle: handle.write(json.dumps(payload).encode("utf-8")))
+
+
+class LRUDirectoryCache:
+    """Size-bounded LRU of entries stored as files in one directory.
+
+    An entry is one file per suffix in ``SUFFIXES``, all named after its key; the first
+    suffix is written first. Reads refresh an entry's mtime with ``touch`` and writes
+    evict the least recently used entries until the directory fits in ``max_bytes``.
+    """
+
+    SUFFIXES: Sequence[str] = (".json",)
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def paths(self, key: str) -> List[str]:
+        return [os.path.join(self.root, f"{key}{suffix}") for suffix in self.SUFFIXES]
+
+    def touch(self, key: str) -> None:
+        now = time.time()
+        for path in self.paths(key):
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+
+    def store(self, key: str, *writes: Callable[[Any], Any]) -> None:
+        """Atomically write each file of an entry, one ``write`` callable per suffix."""
+
+        with self._lock:
+            for path, write in zip(self.paths(key), writes):
+                atomic_write(path, write)
+            self.evict()
+
+    def evict(self) -> None:
+        entries: Dict[str, List[float]] = {}
+        for name in os.listdir(self.root):
+            suffix = next((s for s in self.SUFFIXES if name.endswith(s)), None)
+            if suffix is None:
+                continue
+            try:
+                stat = os.stat(os.path.join(self.root, name))
+            except OSError:
+                continue
+            entry = entries.setdefault(name[: -len(suffix)], [0.0, 0])
+            entry[0] = max(entry[0], stat.st_mtime)
+            entry[1] += stat.st_size
+
+        total = sum(size for _, size in entries.values())
+        for key, (_, size) in sorted(entries.items(), key=lambda item: item[1][0]):
+            if total <= self.max_bytes:
+                break
+            for path in self.paths(key):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            total -= size
+
+
 class FalConfig:
     """Manage access to the fal.ai API client and credentials."""
 
@@ -82,6 +250,420 @@ class FalConfig:
         return self._key
 
 
+class MultipartUploadSession:
+    """Client for fal's CDN multipart protocol: create, upload numbered parts, complete."""
+
+    def __init__(self, client: SyncClient, file_name: str, content_type: str):
+        if not MultipartUploadSession.supported(client):
+            raise RuntimeError("Installed fal-client does not support multipart uploads")
+        self._token_manager = client._token_manager
+        self.file_name = file_name
+        self.content_type = content_type
+        self.access_url: Optional[str] = None
+        self.upload_id: Optional[str] = None
+
+    @staticmethod
+    def supported(client: SyncClient) -> bool:
+        """Whether ``client`` exposes the CDN token manager the multipart protocol needs."""
+
+        return getattr(client, "_token_manager", None) is not None
+
+    def _auth_headers(self) -> Dict[str, str]:
+        token = self._token_manager.get_token()
+        return {"Authorization": f"{token.token_type} {token.token}"}
+
+    def create(self) -> None:
+        token = self._token_manager.get_token()
+        response = _HTTP_SESSION.post(
+            f"{token.base_upload_url}/files/upload/multipart",
+            headers={
+                **self._auth_headers(),
+                "Accept": "application/json",
+                "Content-Type": self.content_type,
+                "X-Fal-File-Name": self.file_name,
+            },
+            timeout=_HTTP_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+        payload = response.json()
+        self.access_url = payload["access_url"]
+        self.upload_id = payload["uploadId"]
+
+    def resume(self, access_url: str, upload_id: str) -> None:
+        """Attach to a multipart upload created by an earlier session."""
+
+        self.access_url = access_url
+        self.upload_id = upload_id
+
+    def upload_part(self, part_number: int, data: bytes) -> str:
+        """Upload one part and return its ETag, retrying transient failures of that part only."""
+
+        for attempt in range(_UPLOAD_PART_RETRIES + 1):
+            try:
+                response = _HTTP_SESSION.put(
+                    f"{self.access_url}/multipart/{self.upload_id}/{part_number}",
+                    headers={
+                        **self._auth_headers(),
+                        "Content-Type": self.content_type,
+                        # Compressed responses drop the ETag header that complete() needs
+                        "Accept-Encoding": "identity",
+                    },
+                    data=data,
+                    timeout=None,
+                )
+                response.raise_for_status()
+                return response.headers["etag"]
+            except requests.RequestException as exc:
+                status = getattr(exc.response, "status_code", None)
+                retryable = status is None or status == 429 or status >= 500
+                if not retryable or attempt == _UPLOAD_PART_RETRIES:
+                    raise
+                delay = 0.5 * 2**attempt
+                print(
+                    f"Warning: upload of part {part_number} failed ({exc}); "
+                    f"retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+
+    def complete(self, etags: Dict[int, str]) -> str:
+        parts = [
+            {"partNumber": number, "etag": etags[number]} for number in sorted(etags)
+        ]
+        response = _HTTP_SESSION.post(
+            f"{self.access_url}/multipart/{self.upload_id}/complete",
+            headers=self._auth_headers(),
+            json={"parts": parts},
+            timeout=_HTTP_TIMEOUT_SECONDS,
+        )
+        response.raise_for_status()
+        return str(self.access_url)
+
+
+class UploadManifest:
+    """On-disk record of a multipart upload's id and finished parts, keyed by ``key``."""
+
+    def __init__(self, key: str, manifest_dir: Optional[str] = None):
+        self.manifest_dir = manifest_dir or _UPLOAD_MANIFEST_DIR
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        self.path = os.path.join(self.manifest_dir, f"{digest}.json")
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                manifest = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(manifest, dict) or not manifest.get("upload_id"):
+            return None
+        if time.time() - float(manifest.get("created", 0)) > _UPLOAD_RESUME_TTL_SECONDS:
+            return None
+        return manifest
+
+    def save(self, manifest: Dict[str, Any]) -> None:
+        try:
+            atomic_write_json(self.path, manifest)
+        except OSError as exc:
+            print(f"Warning: failed to record upload progress: {exc}")
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def new(session: "MultipartUploadSession") -> Dict[str, Any]:
+        return {
+            "access_url": session.access_url,
+            "upload_id": session.upload_id,
+            "created": time.time(),
+            "etags": {},
+            "digests": {},
+        }
+
+
+def is_stale_upload_error(exc: BaseException) -> bool:
+    """Whether a resumed upload failed because the backend no longer knows its upload id."""
+
+    if not isinstance(exc, HTTPError):
+        return False
+    status = getattr(exc.response, "status_code", None)
+    return status is not None and 400 <= status < 500 and status != 429
+
+
+class ChunkedUploadWriter:
+    """Write-only file object that uploads fixed-size parts while the producer keeps writing.
+
+    Data that never fills a single part is sent with a plain ``client.upload`` on
+    ``finish()``, so small outputs pay no multipart overhead.
+
+    With ``resume_key`` every finished part is recorded, with a hash of its bytes, in an
+    ``UploadManifest``. Writing the same deterministic stream again under that key
+    rebuilds it in memory but skips parts whose hash matches, so an interrupted upload
+    resumes without keeping a copy of the data on disk.
+    """
+
+    def __init__(
+        self,
+        client: SyncClient,
+        file_name: str,
+        content_type: str,
+        chunk_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        resume_key: Optional[str] = None,
+    ):
+        self._client = client
+        self.file_name = file_name
+        self.content_type = content_type
+        self.chunk_size = chunk_size or _UPLOAD_CHUNK_BYTES
+        self.max_concurrency = max(1, max_concurrency or _UPLOAD_MAX_CONCURRENCY)
+        self._manifest_store = (
+            UploadManifest(repr((resume_key, self.chunk_size, content_type)))
+            if resume_key
+            else None
+        )
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._manifest_lock = threading.Lock()
+        self.resumed = False
+        self.bytes_written = 0
+        self._buffer = bytearray()
+        self._session: Optional[MultipartUploadSession] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[int, Future] = {}
+        # Bounds the parts held in memory when the network is slower than the producer
+        self._slots = threading.BoundedSemaphore(self.max_concurrency * 2)
+        self._closed = False
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def write(self, data) -> int:
+        if self._closed:
+            raise ValueError("write to a finished upload")
+        size = len(memoryview(data).cast("B"))
+        self._buffer += data
+        self.bytes_written += size
+        while len(self._buffer) >= self.chunk_size:
+            part = bytes(self._buffer[: self.chunk_size])
+            del self._buffer[: self.chunk_size]
+            self._submit_part(part)
+        return size
+
+    def flush(self) -> None:
+        pass
+
+    def _start_session(self) -> None:
+        self._session = MultipartUploadSession(self._client, self.file_name, self.content_type)
+        manifest = self._manifest_store.load() if self._manifest_store else None
+        if manifest is not None:
+            self._session.resume(manifest["access_url"], manifest["upload_id"])
+            manifest.setdefault("digests", {})
+            self.resumed = True
+            print(
+                f"Resuming upload of {self.file_name}: "
+                f"{len(manifest['etags'])} parts already uploaded"
+            )
+        else:
+            self._session.create()
+            if self._manifest_store:
+                manifest = UploadManifest.new(self._session)
+                self._manifest_store.save(manifest)
+        self._manifest = manifest
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+
+    def _upload_recorded_part(self, part_number: int, data: bytes, digest: str) -> str:
+        etag = self._session.upload_part(part_number, data)
+        with self._manifest_lock:
+            self._manifest["etags"][str(part_number)] = etag
+            self._manifest["digests"][str(part_number)] = digest
+            self._manifest_store.save(self._manifest)
+        return etag
+
+    def _submit_part(self, data: bytes) -> None:
+        if self._session is None:
+            self._start_session()
+
+        for future in self._futures.values():
+            # Stop feeding the encoder as soon as any part has failed
+            if future.done() and future.exception() is not None:
+                raise future.exception()
+
+        part_number = len(self._futures) + 1
+        if self._manifest is None:
+            self._slots.acquire()
+            future = self._executor.submit(self._session.upload_part, part_number, data)
+        else:
+            key = str(part_number)
+            digest = hashlib.sha256(data).hexdigest()
+            if self._manifest["digests"].get(key) == digest and key in self._manifest["etags"]:
+                # Identical bytes were already uploaded as this part by an earlier attempt
+                future = Future()
+                future.set_result(self._manifest["etags"][key])
+                self._futures[part_number] = future
+                return
+            self._slots.acquire()
+            future = self._executor.submit(
+                self._upload_recorded_part, part_number, data, digest
+            )
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures[part_number] = future
+
+    def finish(self) -> str:
+        """Upload whatever is buffered, complete the upload and return its URL."""
+
+        self._closed = True
+        if self._session is None:
+            return self._client.upload(
+                bytes(self._buffer),
+                content_type=self.content_type,
+                file_name=self.file_name,
+            )
+
+        try:
+            if self._buffer:
+                self._submit_part(bytes(self._buffer))
+                self._buffer.clear()
+            etags = {number: future.result() for number, future in self._futures.items()}
+            url = self._session.complete(etags)
+        finally:
+            self._executor.shutdown(wait=True)
+        if self._manifest_store:
+            self._manifest_store.clear()
+        return url
+
+    def discard_resume(self, error: BaseException) -> bool:
+        """Forget a resumed upload the backend rejected, so writing again starts afresh."""
+
+        if not (self.resumed and is_stale_upload_error(error)):
+            return False
+        print(f"Warning: could not resume upload of {self.file_name} ({error})")
+        self._manifest_store.clear()
+        return True
+
+    def abort(self) -> None:
+        self._closed = True
+        self._buffer.clear()
+        if self._executor is not None:
+            for future in self._futures.values():
+                future.cancel()
+            self._executor.shutdown(wait=True)
+
+
+class ResumableFileUpload:
+    """Upload a local file in parallel parts, recording finished parts in a manifest.
+
+    The manifest is keyed by the file's path, size and modification time. Running the
+    same upload again after a crash or network failure only sends the missing parts.
+    """
+
+    def __init__(
+        self,
+        client: SyncClient,
+        path,
+        content_type: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        manifest_dir: Optional[str] = None,
+    ):
+        self._client = client
+        self.path = Path(path)
+        self.file_name = self.path.name
+        self.content_type = (
+            content_type
+            or mimetypes.guess_type(self.file_name)[0]
+            or "application/octet-stream"
+        )
+        self.chunk_size = chunk_size or _UPLOAD_CHUNK_BYTES
+        self.max_concurrency = max(1, max_concurrency or _UPLOAD_MAX_CONCURRENCY)
+        self.manifest_dir = manifest_dir or _UPLOAD_MANIFEST_DIR
+        self._lock = threading.Lock()
+
+        stat = self.path.stat()
+        self.size = stat.st_size
+        key = repr(
+            (
+                os.fspath(self.path.resolve()),
+                stat.st_size,
+                stat.st_mtime_ns,
+                self.chunk_size,
+                self.content_type,
+            )
+        )
+        self._manifest = UploadManifest(key, self.manifest_dir)
+        self.manifest_path = self._manifest.path
+
+    def _read_part(self, part_number: int) -> bytes:
+        with open(self.path, "rb") as handle:
+            handle.seek((part_number - 1) * self.chunk_size)
+            return handle.read(self.chunk_size)
+
+    def _upload_part(
+        self, session: MultipartUploadSession, manifest: Dict[str, Any], part_number: int
+    ) -> None:
+        etag = session.upload_part(part_number, self._read_part(part_number))
+        with self._lock:
+            manifest["etags"][str(part_number)] = etag
+            self._manifest.save(manifest)
+
+    def _run(self, session: MultipartUploadSession, manifest: Dict[str, Any]) -> str:
+        part_count = -(-self.size // self.chunk_size)
+        missing = [
+            number
+            for number in range(1, part_count + 1)
+            if str(number) not in manifest["etags"]
+        ]
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            futures = [
+                executor.submit(self._upload_part, session, manifest, number)
+                for number in missing
+            ]
+            for future in futures:
+                future.result()
+
+        etags = {int(number): etag for number, etag in manifest["etags"].items()}
+        return session.complete(etags)
+
+    def upload(self) -> str:
+        if self.size <= self.chunk_size:
+            return self._client.upload(
+                self.path.read_bytes(),
+                content_type=self.content_type,
+                file_name=self.file_name,
+            )
+
+        session = MultipartUploadSession(self._client, self.file_name, self.content_type)
+        manifest = self._manifest.load()
+        if manifest is not None:
+            session.resume(manifest["access_url"], manifest["upload_id"])
+            print(
+                f"Resuming upload of {self.file_name}: "
+                f"{len(manifest['etags'])} parts already uploaded"
+            )
+            try:
+                url = self._run(session, manifest)
+                self._manifest.clear()
+                return url
+            except HTTPError as exc:
+                if not is_stale_upload_error(exc):
+                    raise
+                # The backend no longer knows this upload; start over from scratch
+                print(f"Warning: could not resume upload of {self.file_name} ({exc})")
+                self._manifest.clear()
+                session = MultipartUploadSession(
+                    self._client, self.file_name, self.content_type
+                )
+
+        session.create()
+        manifest = UploadManifest.new(session)
+        self._manifest.save(manifest)
+        url = self._run(session, manifest)
+        self._manifest.clear()
+        return url
+
+
 class ImageUtils:
     """Utility functions for image processing and uploads."""
 
@@ -115,6 +697,34 @@ class ImageUtils:
             print(f"Error converting tensor to PIL: {str(e)}")
             return None
 
+    @staticmethod
+    def downscale_image(image, max_side: int, max_short_side: int = 0):
+        """Shrink an IMAGE tensor so it fits the given side limits, on the tensor's own device.
+
+        ``max_side`` bounds the longer edge and ``max_short_side`` (0 = unbounded) the
+        shorter one. Images already within the limits are returned unchanged.
+        """
+
+        if not isinstance(image, torch.Tensor) or image.ndim not in (3, 4):
+            return image
+        batch = image if image.ndim == 4 else image.unsqueeze(0)
+        height, width = int(batch.shape[1]), int(batch.shape[2])
+        scale = max_side / max(height, width) if max_side > 0 else 1.0
+        if max_short_side > 0:
+            scale = min(scale, max_short_side / min(height, width))
+        if scale >= 1.0:
+            return image
+
+        size = (max(1, round(height * scale)), max(1, round(width * scale)))
+        resized = F.interpolate(
+            batch.movedim(-1, 1).float(),
+            size=size,
+            mode="bilinear",
+            align_corners=False,
+            antialias=True,
+        ).movedim(1, -1).clamp(0.0, 1.0)
+        return resized if image.ndim == 4 else resized[0]
+
     @staticmethod
     def upload_image(image):
         """Upload image tensor to FAL and return URL."""
@@ -150,6 +760,86 @@ class ImageUtils:
         return result
 
 
+def _disable_tensor_subclasses():
+    return torch._C.DisableTorchFunctionSubclass()
+
+
+class Uint8FrameTensor(torch.Tensor):
+    """IMAGE tensor that keeps frames as uint8 and expands to float32 in [0, 1] only when used.
+
+    Shape queries, indexing and ``cpu``/``contiguous``/``detach`` stay on the compact
+    uint8 storage, so holding a long clip costs a quarter of the float32 memory.
+    Any other torch operation sees an ordinary float32 IMAGE tensor. The frames are
+    read-only: in-place operations would only modify a temporary float copy, so they
+    raise instead of being silently lost; ``clone()`` returns an editable float copy.
+    Only returned by LoadVideoURL when ``output_precision`` is ``uint8``.
+    """
+
+    _METADATA_GETTERS = {
+        torch.Tensor.shape.__get__,
+        torch.Tensor.ndim.__get__,
+        torch.Tensor.device.__get__,
+        torch.Tensor.is_cuda.__get__,
+        torch.Tensor.layout.__get__,
+        torch.Tensor.requires_grad.__get__,
+        torch.Tensor.dim,
+        torch.Tensor.size,
+        torch.Tensor.numel,
+        torch.Tensor.__len__,
+    }
+    # Operations that keep the uint8 storage instead of materialising a float32 copy
+    _STORAGE_PRESERVING = {
+        torch.Tensor.cpu,
+        torch.Tensor.contiguous,
+        torch.Tensor.detach,
+    }
+
+    @staticmethod
+    def __new__(cls, data: torch.Tensor):
+        if data.dtype != torch.uint8:
+            raise ValueError("Uint8FrameTensor requires uint8 data")
+        return torch.Tensor._make_subclass(cls, data)
+
+    def as_uint8(self) -> torch.Tensor:
+        """Return the underlying uint8 frames without expanding them."""
+
+        with _disable_tensor_subclasses():
+            return self.as_subclass(torch.Tensor)
+
+    @classmethod
+    def _expand(cls, value):
+        if isinstance(value, cls):
+            return value.as_uint8().float().div_(255.0)
+        if isinstance(value, (list, tuple)):
+            return type(value)(cls._expand(item) for item in value)
+        if isinstance(value, dict):
+            return {key: cls._expand(item) for key, item in value.items()}
+        return value
+
+    @classmethod
+    def __torch_function__(cls, func, types, args=(), kwargs=None):
+        kwargs = kwargs or {}
+        if func in cls._METADATA_GETTERS:
+            with _disable_tensor_subclasses():
+                return func(*args, **kwargs)
+        if func == torch.Tensor.dtype.__get__:
+            return torch.float32
+        if func is torch.Tensor.__getitem__ or func in cls._STORAGE_PRESERVING:
+            with _disable_tensor_subclasses():
+                result = func(*args, **kwargs)
+            return cls(result) if result.dtype == torch.uint8 else result
+        name = getattr(func, "__name__", "")
+        writes_self = name == "__setitem__" or name.startswith("__i") or (
+            name.endswith("_") and not name.endswith("__")
+        )
+        if writes_self or isinstance(kwargs.get("out"), cls):
+            raise RuntimeError(
+                f"uint8 video frames are read-only ({name}); "
+                "convert with .float() before modifying them"
+            )
+        return func(*cls._expand(args), **cls._expand(kwargs))
+
+
 class VideoUtils:
     """Utility helpers for turning diverse video inputs into fal.ai-uploadable URLs."""
 
@@ -157,21 +847,47 @@ class VideoUtils:
     _CONTENT_TYPE = "video/mp4"
     _DEFAULT_FILENAME = "upload.mp4"
 
+    # Frames quantized per step when converting float tensors, bounding the temporary copies
+    _QUANTIZE_CHUNK_FRAMES = 16
+
+    @staticmethod
+    def _quantize_frames(data: torch.Tensor) -> np.ndarray:
+        frames = np.empty(tuple(data.shape), dtype=np.uint8)
+        step = VideoUtils._QUANTIZE_CHUNK_FRAMES
+        for start in range(0, data.shape[0], step):
+            # clamp() copies first: float() returns the caller's own float32 tensor
+            chunk = data[start : start + step].float().clamp(0.0, 1.0)
+            frames[start : start + step] = (
+                chunk.mul_(255.0).round_().to(torch.uint8).cpu().numpy()
+            )
+        return frames
+
     @staticmethod
     def _tensor_to_uint8_frames(video) -> np.ndarray:
         if video is None:
             raise ValueError("Video input is required for upload")
 
+        if isinstance(video, Uint8FrameTensor):
+            # Already quantized by the loader; skip the float round trip entirely
+            video = video.as_uint8()
+
         if isinstance(video, torch.Tensor):
-            data = video.detach().cpu()
+            data = video.detach()
             if data.ndim != 4:
                 raise ValueError("Expected a 4D tensor for video frames")
             if data.shape[-1] == 3:
-                frames = data.numpy()
+                pass
             elif data.shape[1] == 3:
-                frames = data.permute(0, 2, 3, 1).numpy()
+                data = data.permute(0, 2, 3, 1)
             else:
                 raise ValueError("Video tensor must have three color channels")
+
+            if data.dtype == torch.uint8:
+                frames = np.ascontiguousarray(data.cpu().numpy())
+            elif data.is_floating_point():
+                frames = VideoUtils._quantize_frames(data)
+            else:
+                frames = data.cpu().numpy().astype(np.uint8)
         else:
             array = np.asarray(video)
             if array.ndim != 4 or array.shape[-1] not in (1, 3):
@@ -180,17 +896,79 @@ class VideoUtils:
             if frames.shape[-1] == 1:
                 frames = np.repeat(frames, 3, axis=-1)
 
-        if frames.dtype.kind == "f":
-            frames = np.clip(frames, 0.0, 1.0)
-            frames = (frames * 255.0).round().astype(np.uint8)
-        elif frames.dtype != np.uint8:
-            frames = frames.astype(np.uint8)
+            if frames.dtype.kind == "f":
+                frames = np.clip(frames, 0.0, 1.0)
+                frames = (frames * 255.0).round().astype(np.uint8)
+            elif frames.dtype != np.uint8:
+                frames = frames.astype(np.uint8)
 
         if frames.size == 0:
             raise ValueError("Video tensor did not contain any frames")
 
         return frames
 
+    # Frames quantized and hashed per step of frame_fingerprint, bounding the temporary copy
+    _FINGERPRINT_CHUNK_FRAMES = 16
+
+    @staticmethod
+    def frame_fingerprint(frames) -> str:
+        """Content hash of every pixel of a [N, H, W, C] frame batch, quantized to uint8.
+
+        Float and uint8 copies of the same frames hash identically, so frames loaded
+        from a URL can be recognised after a trip through the graph.
+        """
+
+        if isinstance(frames, Uint8FrameTensor):
+            frames = frames.as_uint8()
+        digest = hashlib.sha256(repr(tuple(frames.shape)).encode("utf-8"))
+        chunk = VideoUtils._FINGERPRINT_CHUNK_FRAMES
+
+        for start in range(0, int(frames.shape[0]), chunk):
+            if isinstance(frames, torch.Tensor):
+                block = frames.detach()[start : start + chunk]
+                if block.is_floating_point():
+                    block = block.float().clamp(0.0, 1.0).mul_(255.0).round_()
+                block = block.to(torch.uint8).cpu().numpy()
+            else:
+                block = np.asarray(frames[start : start + chunk])
+                if block.dtype.kind == "f":
+                    block = np.round(np.clip(block, 0.0, 1.0) * 255.0)
+                block = block.astype(np.uint8)
+            digest.update(np.ascontiguousarray(block).tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _source_url_passthrough(video, video_info: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Return the URL the frames were loaded from when they are still that exact video."""
+
+        if not isinstance(video_info, dict) or not isinstance(video, torch.Tensor):
+            return None
+        source_url = video_info.get("source_url")
+        fingerprint = video_info.get("frame_fingerprint")
+        if not source_url or not fingerprint or video.ndim != 4:
+            return None
+
+        # Only an untrimmed, unresized, unresampled load matches the source file
+        for loaded_key, source_key in (
+            ("loaded_frame_count", "source_frame_count"),
+            ("loaded_width", "source_width"),
+            ("loaded_height", "source_height"),
+            ("loaded_fps", "source_fps"),
+        ):
+            if video_info.get(loaded_key) != video_info.get(source_key):
+                return None
+
+        expected_shape = (
+            video_info.get("loaded_frame_count"),
+            video_info.get("loaded_height"),
+            video_info.get("loaded_width"),
+        )
+        if tuple(video.shape[:3]) != expected_shape:
+            return None
+        if VideoUtils.frame_fingerprint(video) != fingerprint:
+            return None
+        return str(source_url)
+
     @staticmethod
     def _resolve_fps(video_info: Optional[Dict[str, Any]]) -> float:
         if isinstance(video_info, dict):
@@ -204,7 +982,118 @@ class VideoUtils:
         return VideoUtils._DEFAULT_FPS
 
     @staticmethod
-    def _frames_to_mp4_bytes(frames: np.ndarray, fps: float) -> bytes:
+    def _available_encoders() -> List[str]:
+        available = []
+        if av is not None:
+            available.append("pyav")
+        if shutil.which("ffmpeg"):
+            available.append("ffmpeg")
+        available.append("opencv")
+
+        if _VIDEO_ENCODER in available:
+            # Try the configured encoder first but keep the others as fallbacks
+            available.remove(_VIDEO_ENCODER)
+            available.insert(0, _VIDEO_ENCODER)
+        elif _VIDEO_ENCODER != "auto":
+            print(
+                f"Warning: video encoder '{_VIDEO_ENCODER}' is unavailable, using {available[0]}"
+            )
+        return available
+
+    @staticmethod
+    def _pad_to_even(frames: np.ndarray) -> np.ndarray:
+        # yuv420p subsamples chroma 2x2, so H.264 needs even dimensions
+        pad_h = frames.shape[1] % 2
+        pad_w = frames.shape[2] % 2
+        if not pad_h and not pad_w:
+            return frames
+        return np.pad(frames, ((0, 0), (0, pad_h), (0, pad_w), (0, 0)), mode="edge")
+
+    @staticmethod
+    def _encode_pyav(
+        frames: np.ndarray, fps: float, sink, crf: int, preset: str, fragmented: bool
+    ) -> None:
+        frames = VideoUtils._pad_to_even(frames)
+        options = {"movflags": "frag_keyframe+empty_moov"} if fragmented else {}
+        container = av.open(sink, mode="w", format="mp4", options=options)
+        try:
+            rate = Fraction(fps).limit_denominator(1001)
+            stream = container.add_stream("libx264", rate=rate)
+            stream.width = frames.shape[2]
+            stream.height = frames.shape[1]
+            stream.pix_fmt = "yuv420p"
+            stream.options = {"crf": str(crf), "preset": preset}
+            stream.thread_type = "AUTO"
+            stream.codec_context.thread_count = 0
+
+            for frame in frames:
+                video_frame = av.VideoFrame.from_ndarray(frame, format="rgb24")
+                for packet in stream.encode(video_frame):
+                    container.mux(packet)
+            for packet in stream.encode():
+                container.mux(packet)
+        finally:
+            container.close()
+
+    @staticmethod
+    def _encode_ffmpeg(
+        frames: np.ndarray, fps: float, sink, crf: int, preset: str, fragmented: bool
+    ) -> None:
+        frames = VideoUtils._pad_to_even(frames)
+        height, width = frames.shape[1], frames.shape[2]
+        command = [
+            shutil.which("ffmpeg") or "ffmpeg",
+            "-loglevel", "error",
+            "-f", "rawvideo",
+            "-pix_fmt", "rgb24",
+            "-s", f"{width}x{height}",
+            "-r", f"{fps}",
+            "-i", "-",
+            "-c:v", "libx264",
+            "-preset", preset,
+            "-crf", str(crf),
+            "-pix_fmt", "yuv420p",
+            "-threads", "0",
+            # A pipe cannot be seeked back to write the moov atom, so always fragment
+            "-movflags", "frag_keyframe+empty_moov",
+            "-f", "mp4",
+            "-",
+        ]
+        process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+
+        def feed() -> None:
+            try:
+                step = VideoUtils._QUANTIZE_CHUNK_FRAMES
+                for start in range(0, frames.shape[0], step):
+                    chunk = np.ascontiguousarray(frames[start : start + step])
+                    process.stdin.write(chunk.data)
+            except (BrokenPipeError, ValueError):
+                pass
+            finally:
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
+
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+        try:
+            for chunk in iter(lambda: process.stdout.read(1 << 20), b""):
+                sink.write(chunk)
+        finally:
+            feeder.join()
+            stderr = process.stderr.read()
+            process.wait()
+        if process.returncode != 0:
+            detail = stderr.decode(errors="replace").strip()
+            raise RuntimeError(f"ffmpeg exited with {process.returncode}: {detail}")
+
+    @staticmethod
+    def _encode_opencv(
+        frames: np.ndarray, fps: float, sink, crf: int, preset: str, fragmented: bool
+    ) -> None:
         height, width = frames.shape[1], frames.shape[2]
         temp_path: Optional[str] = None
         writer = None
@@ -217,20 +1106,21 @@ class VideoUtils:
             if not writer.isOpened():
                 raise RuntimeError("Failed to initialize video writer")
 
-            for frame in frames:
-                if frame.shape[0] != height or frame.shape[1] != width:
-                    raise ValueError("All video frames must share the same dimensions")
-                bgr_frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                writer.write(bgr_frame)
+            step = VideoUtils._QUANTIZE_CHUNK_FRAMES
+            for start in range(0, frames.shape[0], step):
+                chunk = frames[start : start + step]
+                # Convert a whole chunk in one call by viewing it as a single tall image
+                bgr = cv2.cvtColor(
+                    np.ascontiguousarray(chunk).reshape(-1, width, 3), cv2.COLOR_RGB2BGR
+                ).reshape(chunk.shape)
+                for bgr_frame in bgr:
+                    writer.write(bgr_frame)
 
             writer.release()
             writer = None
 
             with open(temp_path, "rb") as handle:
-                data = handle.read()
-            if not data:
-                raise RuntimeError("Encoded video was empty")
-            return data
+                shutil.copyfileobj(handle, sink)
         finally:
             if writer is not None:
                 writer.release()
@@ -240,18 +1130,255 @@ class VideoUtils:
                 except OSError:
                     pass
 
+    @staticmethod
+    def _encode_frames(
+        encoder: str,
+        frames: np.ndarray,
+        fps: float,
+        sink,
+        crf: int,
+        preset: str,
+        fragmented: bool,
+    ) -> float:
+        """Encode with one backend into ``sink`` and return the elapsed seconds."""
+
+        start = time.monotonic()
+        getattr(VideoUtils, f"_encode_{encoder}")(frames, fps, sink, crf, preset, fragmented)
+        return max(time.monotonic() - start, 1e-6)
+
+    @staticmethod
+    def _log_encode(
+        encoder: str, frame_count: int, elapsed: float, size: int, action: str = "Encoded"
+    ) -> None:
+        print(
+            f"{action} {frame_count} frames with {encoder} in {elapsed:.2f}s "
+            f"({frame_count / elapsed:.1f} fps, {size / 1e6:.1f} MB)"
+        )
+
+    @staticmethod
+    def _frames_to_mp4_bytes(
+        frames: np.ndarray,
+        fps: float,
+        crf: Optional[int] = None,
+        preset: Optional[str] = None,
+    ) -> bytes:
+        crf = _VIDEO_CRF if crf is None else int(crf)
+        preset = preset or _VIDEO_PRESET
+
+        last_error: Optional[Exception] = None
+        for encoder in VideoUtils._available_encoders():
+            buffer = io.BytesIO()
+            try:
+                elapsed = VideoUtils._encode_frames(
+                    encoder, frames, fps, buffer, crf, preset, False
+                )
+            except Exception as exc:
+                print(f"Warning: {encoder} video encoder failed: {exc}")
+                last_error = exc
+                continue
+
+            data = buffer.getvalue()
+            if not data:
+                last_error = RuntimeError("Encoded video was empty")
+                continue
+            VideoUtils._log_encode(encoder, frames.shape[0], elapsed, len(data))
+            return data
+
+        raise RuntimeError(f"All video encoders failed: {last_error}")
+
+    @staticmethod
+    def split_mp4_at_keyframes(data: bytes, segment_frames: int) -> List[bytes]:
+        """Cut an MP4 into video-only segments of at least ``segment_frames`` frames.
+
+        Packets are copied as they are, so every cut lands on the first keyframe at or
+        after the requested boundary and nothing is re-encoded.
+        """
+
+        if av is None:
+            raise RuntimeError("PyAV is required to split videos without re-encoding")
+
+        segments: List[bytes] = []
+        with av.open(io.BytesIO(data)) as source:
+            stream = source.streams.video[0]
+            sink = None
+            target = None
+            target_stream = None
+            first_dts = 0
+            frames = 0
+
+            def close_segment() -> None:
+                if target is not None:
+                    target.close()
+                    segments.append(sink.getvalue())
+
+            for packet in source.demux(stream):
+                if packet.dts is None:
+                    continue
+                if packet.is_keyframe and (target is None or frames >= segment_frames):
+                    close_segment()
+                    sink = io.BytesIO()
+                    target = av.open(sink, "w", format="mp4")
+                    target_stream = target.add_stream_from_template(stream)
+                    first_dts = packet.dts
+                    frames = 0
+                if target is None:
+                    continue
+                # Each segment starts at time zero
+                packet.dts -= first_dts
+                if packet.pts is not None:
+                    packet.pts -= first_dts
+                packet.stream = target_stream
+                target.mux(packet)
+                frames += 1
+            close_segment()
+        return segments
+
+    @staticmethod
+    def concat_mp4(segments: Sequence[bytes]) -> bytes:
+        """Join MP4 segments with identical codec settings by copying their packets."""
+
+        if av is None:
+            raise RuntimeError("PyAV is required to join videos without re-encoding")
+
+        sink = io.BytesIO()
+        with av.open(sink, "w", format="mp4") as target:
+            target_stream = None
+            offset = Fraction(0)
+            for data in segments:
+                with av.open(io.BytesIO(data)) as source:
+                    stream = source.streams.video[0]
+                    if target_stream is None:
+                        target_stream = target.add_stream_from_template(stream)
+                    time_base = stream.time_base
+                    frame_ticks = 0
+                    if stream.average_rate:
+                        frame_ticks = round(1 / (stream.average_rate * time_base))
+
+                    first_dts = None
+                    end = 0
+                    for packet in source.demux(stream):
+                        if packet.dts is None:
+                            continue
+                        if first_dts is None:
+                            first_dts = packet.dts
+                        # Shift into the running timeline; muxing rescales from time_base
+                        shift = round(offset / time_base) - first_dts
+                        # Decode order is contiguous across segments; pts keep their own delay
+                        end = max(end, packet.dts - first_dts + (packet.duration or frame_ticks))
+                        packet.dts += shift
+                        if packet.pts is not None:
+                            packet.pts += shift
+                        packet.stream = target_stream
+                        target.mux(packet)
+                    offset += end * time_base
+        return sink.getvalue()
+
+    @staticmethod
+    def copy_audio(video: bytes, audio_source: bytes) -> bytes:
+        """Mux the audio track of ``audio_source`` into ``video`` without re-encoding either.
+
+        ``video`` is returned unchanged when the source has no audio track.
+        """
+
+        if av is None:
+            raise RuntimeError("PyAV is required to copy audio without re-encoding")
+
+        with av.open(io.BytesIO(audio_source)) as audio_input:
+            if not audio_input.streams.audio:
+                return video
+            audio_stream = audio_input.streams.audio[0]
+            sink = io.BytesIO()
+            with av.open(io.BytesIO(video)) as video_input, av.open(
+                sink, "w", format="mp4"
+            ) as target:
+                video_stream = video_input.streams.video[0]
+                outputs = {
+                    video_stream: target.add_stream_from_template(video_stream),
+                    audio_stream: target.add_stream_from_template(audio_stream),
+                }
+                # The interleaving muxer orders the two packet runs by timestamp
+                for source, stream in ((video_input, video_stream), (audio_input, audio_stream)):
+                    for packet in source.demux(stream):
+                        if packet.dts is None:
+                            continue
+                        packet.stream = outputs[stream]
+                        target.mux(packet)
+        return sink.getvalue()
+
+    @staticmethod
+    def download_video(url: str) -> bytes:
+        response = _HTTP_SESSION.get(url, timeout=None)
+        response.raise_for_status()
+        return response.content
+
+    @staticmethod
+    def encode_video(
+        video,
+        fps: float,
+        crf: Optional[int] = None,
+        preset: Optional[str] = None,
+    ) -> bytes:
+        """Encode an IMAGE frame batch to H.264 MP4 bytes without touching the disk."""
+
+        frames = VideoUtils._tensor_to_uint8_frames(video)
+        return VideoUtils._frames_to_mp4_bytes(frames, fps, crf, preset)
+
+    @staticmethod
+    def _stream_frames_upload(
+        client: SyncClient,
+        frames: np.ndarray,
+        fps: float,
+        crf: Optional[int] = None,
+        preset: Optional[str] = None,
+    ) -> Optional[str]:
+        """Upload parts while the encoder is still running; ``None`` means fall back to buffering."""
+
+        crf = _VIDEO_CRF if crf is None else int(crf)
+        preset = preset or _VIDEO_PRESET
+        encoder = VideoUtils._available_encoders()[0]
+        writer = ChunkedUploadWriter(
+            client, VideoUtils._DEFAULT_FILENAME, VideoUtils._CONTENT_TYPE
+        )
+        try:
+            # The sink cannot seek, so the MP4 is written as fragments with an empty moov
+            elapsed = VideoUtils._encode_frames(
+                encoder, frames, fps, writer, crf, preset, True
+            )
+            url = writer.finish()
+        except Exception as exc:
+            writer.abort()
+            print(f"Warning: streaming video upload failed, retrying buffered: {exc}")
+            return None
+
+        VideoUtils._log_encode(
+            encoder, frames.shape[0], elapsed, writer.bytes_written, "Encoded and streamed"
+        )
+        return url
+
     @staticmethod
     def _upload_bytes(client: SyncClient, data: bytes, file_name: str) -> str:
         if not data:
             raise ValueError("Cannot upload empty video data")
-        return client.upload(
-            data,
-            content_type=VideoUtils._CONTENT_TYPE,
-            file_name=file_name,
-        )
+        # Fits in one part, or the client cannot do multipart: a plain upload is enough
+        if len(data) <= _UPLOAD_CHUNK_BYTES or not MultipartUploadSession.supported(client):
+            return client.upload(data, VideoUtils._CONTENT_TYPE, file_name=file_name)
+        # Large videos go up in parallel parts so a failed part is retried on its own
+        writer = ChunkedUploadWriter(client, file_name, VideoUtils._CONTENT_TYPE)
+        try:
+            writer.write(data)
+            return writer.finish()
+        except Exception:
+            writer.abort()
+            raise
 
     @staticmethod
-    def upload_video(video, video_info: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    def upload_video(
+        video,
+        video_info: Optional[Dict[str, Any]] = None,
+        crf: Optional[int] = None,
+        preset: Optional[str] = None,
+        stream_upload: Optional[bool] = None,
+    ) -> Optional[str]:
         try:
             if video is None:
                 raise ValueError("Video input is required for upload")
@@ -265,11 +1392,7 @@ class VideoUtils:
                 path = Path(video)
                 if not path.is_file():
                     raise ValueError(f"Video file not found: {path}")
-                upload_file = getattr(client, "upload_file", None)
-                if callable(upload_file):
-                    return upload_file(os.fspath(path))
-                data = path.read_bytes()
-                return VideoUtils._upload_bytes(client, data, path.name)
+                return ResumableFileUpload(client, path).upload()
 
             if isinstance(video, (bytes, bytearray)):
                 return VideoUtils._upload_bytes(client, bytes(video), VideoUtils._DEFAULT_FILENAME)
@@ -284,9 +1407,19 @@ class VideoUtils:
                 file_name = os.path.basename(getattr(video, "name", VideoUtils._DEFAULT_FILENAME)) or VideoUtils._DEFAULT_FILENAME
                 return VideoUtils._upload_bytes(client, data, file_name)
 
+            source_url = VideoUtils._source_url_passthrough(video, video_info)
+            if source_url:
+                return source_url
+
             frames = VideoUtils._tensor_to_uint8_frames(video)
             fps = VideoUtils._resolve_fps(video_info)
-            data = VideoUtils._frames_to_mp4_bytes(frames, fps)
+            if stream_upload is None:
+                stream_upload = _VIDEO_STREAM_UPLOAD
+            if stream_upload and MultipartUploadSession.supported(client):
+                url = VideoUtils._stream_frames_upload(client, frames, fps, crf, preset)
+                if url:
+                    return url
+            data = VideoUtils._frames_to_mp4_bytes(frames, fps, crf, preset)
             return VideoUtils._upload_bytes(client, data, VideoUtils._DEFAULT_FILENAME)
         except Exception as exc:
             print(f"Error uploading video: {str(exc)}")
@@ -354,17 +1487,21 @@ class ResultProcessor:
         stacked_images = np.stack(arrays, axis=0)
         return torch.from_numpy(stacked_images)
 
+    @staticmethod
+    def images_from_result(result: Any) -> torch.Tensor:
+        """Download every image of a result into one tensor, raising on failure."""
+        urls = ResultProcessor._extract_image_urls(result)
+        if not urls:
+            raise ValueError("FAL response did not include any image URLs")
+
+        images = [ResultProcessor._download_image(url).convert("RGB") for url in urls]
+        return ResultProcessor._images_to_tensor(images)
+
     @staticmethod
     def process_image_result(result: Any):
         """Process image generation result and return tensor."""
         try:
-            urls = ResultProcessor._extract_image_urls(result)
-            if not urls:
-                raise ValueError("FAL response did not include any image URLs")
-
-            images = [ResultProcessor._download_image(url).convert("RGB") for url in urls]
-            tensor = ResultProcessor._images_to_tensor(images)
-            return (tensor,)
+            return (ResultProcessor.images_from_result(result),)
         except Exception as e:
             print(f"Error processing image result: {str(e)}")
             return ResultProcessor.create_blank_image()
@@ -392,6 +1529,97 @@ class FalAPIError(RuntimeError):
         self.message = message
 
 
+class FalJobTimeoutError(FalAPIError):
+    """Raised when waiting for a job exceeds the caller's timeout."""
+
+
+class TextResponseCache(LRUDirectoryCache):
+    """Size-bounded LRU of text responses stored as one small JSON file per request."""
+
+    # Arguments that only affect scheduling or point at a per-upload URL, not the answer
+    _IGNORED_ARGUMENTS = ("priority", "image_url")
+
+    @staticmethod
+    def should_cache(cache_mode: str, temperature: Optional[float]) -> bool:
+        if cache_mode == "always":
+            return True
+        return cache_mode == "auto" and temperature is not None and float(temperature) == 0.0
+
+    @staticmethod
+    def image_fingerprint(image) -> str:
+        """Exact content hash of an IMAGE tensor, independent of where it gets uploaded."""
+
+        data = image.detach().cpu().contiguous() if isinstance(image, torch.Tensor) else image
+        array = np.ascontiguousarray(np.asarray(data))
+        digest = hashlib.sha256(repr((array.shape, array.dtype.str)).encode("utf-8"))
+        digest.update(memoryview(array).cast("B"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(
+        endpoint: str, arguments: Dict[str, Any], image_fingerprint: Optional[str] = None
+    ) -> str:
+        payload = json.dumps(
+            {
+                "version": _TEXT_CACHE_VERSION,
+                "endpoint": endpoint,
+                "arguments": {
+                    key: value
+                    for key, value in arguments.items()
+                    if key not in TextResponseCache._IGNORED_ARGUMENTS
+                },
+                "image": image_fingerprint,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with open(self.paths(key)[0], "r", encoding="utf-8") as handle:
+                output = json.load(handle).get("output")
+        except (OSError, ValueError, AttributeError):
+            return None
+        if not isinstance(output, str):
+            return None
+        self.touch(key)
+        return output
+
+    def put(self, key: str, output: str) -> None:
+        payload = json.dumps({"output": output, "created": time.time()}).encode("utf-8")
+        try:
+            self.store(key, lambda handle: handle.write(payload))
+        except OSError as exc:
+            print(f"Warning: failed to cache text response: {exc}")
+
+
+_TEXT_CACHE = TextResponseCache(_TEXT_CACHE_DIR, _TEXT_CACHE_MAX_BYTES)
+
+
+class LatencyTracker:
+    """Rolling window of recent request latencies per model."""
+
+    def __init__(self, window: int):
+        self._samples: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._samples[key].append(seconds)
+
+    def percentile(self, key: str, q: float) -> Optional[float]:
+        """Return the q-quantile of recent samples, or None until enough have been seen."""
+
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < _LATENCY_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+_TEXT_LATENCY = LatencyTracker(_LATENCY_WINDOW)
+
+
 class ApiHandler:
     """Utility functions for API interactions."""
 
@@ -417,22 +1645,37 @@ class ApiHandler:
         return None
 
     @staticmethod
-    def submit_and_get_result(endpoint: str, arguments: Dict[str, Any]):
-        """Submit job to FAL API and get result with robust error handling."""
-
-        client = FalConfig().get_client()
-        handler = client.submit(endpoint, arguments=arguments)
+    def _await_handle(
+        endpoint: str,
+        handler,
+        timeout: Optional[float] = _JOB_TIMEOUT_SECONDS,
+        poll_interval: float = _JOB_POLL_INTERVAL_SECONDS,
+        cancel_on_timeout: bool = True,
+        cancel_event: Optional[threading.Event] = None,
+    ):
+        """Poll a request handle until it completes; ``timeout=None`` waits indefinitely.
+
+        Setting ``cancel_event`` from another thread cancels the remote request.
+        """
 
         start = time.monotonic()
         try:
-            for status in handler.iter_events(interval=_JOB_POLL_INTERVAL_SECONDS):
+            for status in handler.iter_events(interval=poll_interval):
                 if isinstance(status, Completed):
                     break
-                if time.monotonic() - start > _JOB_TIMEOUT_SECONDS:
+                if cancel_event is not None and cancel_event.is_set():
                     handler.cancel()
-                    raise FalAPIError(endpoint, "Request timed out while waiting for completion")
+                    raise FalAPIError(endpoint, "Request cancelled")
+                if timeout is not None and time.monotonic() - start > timeout:
+                    if cancel_on_timeout:
+                        handler.cancel()
+                    raise FalJobTimeoutError(
+                        endpoint, "Request timed out while waiting for completion"
+                    )
 
             result = handler.get()
+        except FalAPIError:
+            raise
         except HTTPError as http_error:
             raise FalAPIError(endpoint, ApiHandler._format_http_error(http_error)) from http_error
         except Exception as exc:
@@ -444,8 +1687,89 @@ class ApiHandler:
 
         return result
 
+    @staticmethod
+    def submit_and_get_result(endpoint: str, arguments: Dict[str, Any]):
+        """Submit job to FAL API and get result with robust error handling."""
+
+        client = FalConfig().get_client()
+        handler = client.submit(endpoint, arguments=arguments)
+        return ApiHandler._await_handle(endpoint, handler)
+
+    @staticmethod
+    def submit_job(endpoint: str, arguments: Dict[str, Any]) -> str:
+        """Queue a job without waiting for it and return its request id."""
+
+        client = FalConfig().get_client()
+        try:
+            handler = client.submit(endpoint, arguments=arguments)
+        except HTTPError as http_error:
+            raise FalAPIError(endpoint, ApiHandler._format_http_error(http_error)) from http_error
+        except Exception as exc:
+            raise FalAPIError(endpoint, str(exc)) from exc
+        return handler.request_id
+
+    @staticmethod
+    def get_job_result(
+        endpoint: str,
+        request_id: str,
+        wait: bool = True,
+        timeout: Optional[float] = None,
+        poll_interval: float = _JOB_POLL_INTERVAL_SECONDS,
+    ):
+        """Fetch the result of a previously submitted job.
+
+        With ``wait=False`` the status is checked once and ``None`` is returned while the
+        job is still queued or running. Timing out never cancels the job itself.
+        """
+
+        client = FalConfig().get_client()
+        try:
+            handler = client.get_handle(endpoint, request_id)
+            status = None if wait else handler.status()
+        except HTTPError as http_error:
+            raise FalAPIError(endpoint, ApiHandler._format_http_error(http_error)) from http_error
+        except Exception as exc:  # fal_client raises its own httpx-based errors here
+            raise FalAPIError(endpoint, str(exc)) from exc
+        if not wait and not isinstance(status, Completed):
+            return None
+        return ApiHandler._await_handle(
+            endpoint,
+            handler,
+            timeout=timeout,
+            poll_interval=poll_interval,
+            cancel_on_timeout=False,
+        )
+
+    @staticmethod
+    def split_image_arguments(
+        endpoint: str, arguments: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Split a num_images request above the endpoint's limit into several requests.
+
+        Request ``k`` uses ``seed + k`` so a seeded run stays reproducible; the first
+        request keeps the original seed, matching what an unsplit request would return.
+        Derived seeds past the signed 32-bit range wrap around to 1, never to 0.
+        """
+        limit = _NUM_IMAGES_LIMITS.get(endpoint, _DEFAULT_NUM_IMAGES_LIMIT)
+        requested = int(arguments.get("num_images", 1))
+        if requested <= limit:
+            return [arguments]
+
+        requests_args = []
+        for index, start in enumerate(range(0, requested, limit)):
+            part = {**arguments, "num_images": min(limit, requested - start)}
+            if arguments.get("seed") is not None and index:
+                seed = int(arguments["seed"]) + index
+                part["seed"] = 1 + (seed - 1) % _SPLIT_SEED_MAX
+            requests_args.append(part)
+        return requests_args
+
     @staticmethod
     def run_image_job(model_name: str, endpoint: str, arguments: Dict[str, Any]):
+        parts = ApiHandler.split_image_arguments(endpoint, arguments)
+        if len(parts) > 1:
+            return ApiHandler._run_split_image_job(model_name, endpoint, parts)
+
         try:
             result = ApiHandler.submit_and_get_result(endpoint, arguments)
         except Exception as exc:  # Already wrapped by FalAPIError when appropriate
@@ -456,6 +1780,34 @@ class ApiHandler:
         except Exception as exc:
             return ApiHandler.handle_image_generation_error(model_name, exc)
 
+    @staticmethod
+    def _run_split_image_job(model_name: str, endpoint: str, parts: List[Dict[str, Any]]):
+        def run_part(part):
+            try:
+                result = ApiHandler.submit_and_get_result(endpoint, part)
+                return ResultProcessor.images_from_result(result)
+            except Exception as exc:
+                message = exc.message if isinstance(exc, FalAPIError) else str(exc)
+                print(f"Warning: {model_name} split request failed: {message}")
+                return None
+
+        workers = min(_IMAGE_SPLIT_MAX_PARALLEL, len(parts))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            batches = [batch for batch in executor.map(run_part, parts) if batch is not None]
+        if not batches:
+            return ApiHandler.handle_image_generation_error(
+                model_name, f"All {len(parts)} split requests failed"
+            )
+
+        # Same arguments give the same size, but guard against an endpoint rounding differently
+        height, width = batches[0].shape[1:3]
+        for index, batch in enumerate(batches):
+            if batch.shape[1:3] != (height, width):
+                batches[index] = F.interpolate(
+                    batch.movedim(-1, 1), size=(height, width), mode="bilinear", antialias=True
+                ).movedim(1, -1)
+        return (torch.cat(batches, dim=0),)
+
     @staticmethod
     def run_single_image_job(model_name: str, endpoint: str, arguments: Dict[str, Any]):
         try:
@@ -494,36 +1846,182 @@ class ApiHandler:
                 return str(result["url"])
         raise ValueError("FAL response did not include a video url")
 
+    @staticmethod
+    def generate_video_url(endpoint: str, arguments: Dict[str, Any]) -> str:
+        """Run a video job and return the output video URL, raising on failure."""
+
+        result = ApiHandler.submit_and_get_result(endpoint, arguments)
+        return ApiHandler._extract_video_url(result)
+
     @staticmethod
     def run_video_job(model_name: str, endpoint: str, arguments: Dict[str, Any]):
         try:
-            result = ApiHandler.submit_and_get_result(endpoint, arguments)
+            return (ApiHandler.generate_video_url(endpoint, arguments),)
         except Exception as exc:
             return ApiHandler.handle_video_generation_error(model_name, exc)
 
+    @staticmethod
+    def extract_text_output(endpoint: str, result: Any) -> str:
+        output = result.get("output") if isinstance(result, dict) else None
+        if isinstance(output, str):
+            return output
+        if isinstance(output, list):
+            return "\n".join(str(item) for item in output).strip()
+        raise FalAPIError(endpoint, "FAL response did not include textual output")
+
+    @staticmethod
+    def get_cached_text(cache_key: str) -> Optional[str]:
+        return _TEXT_CACHE.get(cache_key)
+
+    @staticmethod
+    def stream_text(
+        endpoint: str,
+        arguments: Dict[str, Any],
+        on_partial: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Run a text job through the streaming endpoint, reporting the text as it grows.
+
+        Each any-llm event carries the cumulative output so far. If the stream fails
+        before producing anything, the request is retried through the queue instead.
+        """
+
+        client = FalConfig().get_client()
+        output = ""
+        received = False
         try:
-            video_url = ApiHandler._extract_video_url(result)
-            return (video_url,)
+            events = client.stream(endpoint, arguments=arguments, timeout=_JOB_TIMEOUT_SECONDS)
+            for event in events:
+                received = True
+                if not isinstance(event, dict):
+                    continue
+                if event.get("error"):
+                    raise FalAPIError(endpoint, str(event["error"]))
+                text = event.get("output")
+                if isinstance(text, str) and text != output:
+                    output = text
+                    if on_partial is not None:
+                        on_partial(output)
+        except FalAPIError:
+            raise
         except Exception as exc:
-            return ApiHandler.handle_video_generation_error(model_name, exc)
+            if received:
+                raise FalAPIError(endpoint, f"Stream interrupted: {exc}") from exc
+            print(f"Warning: streaming {endpoint} failed ({exc}); using the queue instead")
+            result = ApiHandler.submit_and_get_result(endpoint, arguments)
+            output = ApiHandler.extract_text_output(endpoint, result)
+            if on_partial is not None:
+                on_partial(output)
+        return output
 
     @staticmethod
-    def run_text_job(model_name: str, endpoint: str, arguments: Dict[str, Any]):
-        try:
+    def generate_text(
+        endpoint: str,
+        arguments: Dict[str, Any],
+        cache_key: Optional[str] = None,
+        stream: bool = False,
+        on_partial: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        """Run a text job and return its output, raising ``FalAPIError`` on failure.
+
+        With a ``cache_key`` a previously cached response is returned without a request,
+        and a fresh response is stored under that key. Errors are never cached.
+        """
+
+        if cache_key:
+            cached = ApiHandler.get_cached_text(cache_key)
+            if cached is not None:
+                return cached
+
+        start = time.monotonic()
+        if stream:
+            output = ApiHandler.stream_text(endpoint, arguments, on_partial)
+        else:
             result = ApiHandler.submit_and_get_result(endpoint, arguments)
+            output = ApiHandler.extract_text_output(endpoint, result)
+            _TEXT_LATENCY.record(str(arguments.get("model")), time.monotonic() - start)
+        if cache_key:
+            _TEXT_CACHE.put(cache_key, output)
+        return output
+
+    @staticmethod
+    def hedge_delay(model: str, quantile: float = 0.9) -> float:
+        """Seconds to wait on ``model`` before hedging: its measured latency quantile."""
+
+        measured = _TEXT_LATENCY.percentile(model, quantile)
+        return _HEDGE_DEFAULT_DELAY_SECONDS if measured is None else measured
+
+    @staticmethod
+    def race_text_jobs(
+        endpoint: str, candidates: Sequence[Dict[str, Any]], delays: Sequence[float]
+    ):
+        """Submit each candidate's arguments at its delay and return the first good answer.
+
+        A candidate whose predecessors all failed is launched right away instead of
+        waiting out its delay. Once one answer arrives every other request is cancelled.
+        Returns ``(model, output)``; raises ``FalAPIError`` when every candidate fails.
+        """
+
+        client = FalConfig().get_client()
+        answers: "queue.Queue" = queue.Queue()
+        cancel_event = threading.Event()
+        launched = 0
+        finished = 0
+        errors: List[str] = []
+        start = time.monotonic()
+
+        def run(arguments: Dict[str, Any]) -> None:
+            model = str(arguments.get("model"))
+            launched_at = time.monotonic()
+            try:
+                handler = client.submit(endpoint, arguments=arguments)
+                result = ApiHandler._await_handle(endpoint, handler, cancel_event=cancel_event)
+                output = ApiHandler.extract_text_output(endpoint, result)
+            except Exception as exc:
+                message = exc.message if isinstance(exc, FalAPIError) else str(exc)
+                answers.put((model, None, message))
+                return
+            _TEXT_LATENCY.record(model, time.monotonic() - launched_at)
+            answers.put((model, output, None))
+
+        while True:
+            while launched < len(candidates) and (
+                launched == finished or time.monotonic() - start >= delays[launched]
+            ):
+                threading.Thread(target=run, args=(candidates[launched],), daemon=True).start()
+                launched += 1
+
+            wait = None
+            if launched < len(candidates):
+                wait = max(0.0, delays[launched] - (time.monotonic() - start))
+            try:
+                model, output, error = answers.get(timeout=wait)
+            except queue.Empty:
+                continue
+
+            finished += 1
+            if error is None:
+                cancel_event.set()
+                return model, output
+            errors.append(f"{model}: {error}")
+            if finished == len(candidates):
+                raise FalAPIError(endpoint, "; ".join(errors))
+
+    @staticmethod
+    def run_text_job(
+        model_name: str,
+        endpoint: str,
+        arguments: Dict[str, Any],
+        cache_key: Optional[str] = None,
+        stream: bool = False,
+        on_partial: Optional[Callable[[str], None]] = None,
+    ):
+        try:
+            return (
+                ApiHandler.generate_text(endpoint, arguments, cache_key, stream, on_partial),
+            )
         except Exception as exc:
             return ApiHandler.handle_text_generation_error(model_name, exc)
 
-        output = result.get("output") if isinstance(result, dict) else None
-        if isinstance(output, str):
-            return (output,)
-        if isinstance(output, list):
-            joined = "\n".join(str(item) for item in output)
-            return (joined.strip(),)
-        return ApiHandler.handle_text_generation_error(
-            model_name, "FAL response did not include textual output"
-        )
-
     @staticmethod
     def handle_video_generation_error(model_name, error):
         """Handle video generation errors consistently."""
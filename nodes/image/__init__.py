@@ -11,6 +11,7 @@ from . import (
     seededit,
     seedream,
     recraft,
+    sweep,
 )
 
 _MODULES = [
@@ -24,6 +25,7 @@ _MODULES = [
     flux,
     seedream,
     nanobanana,
+    sweep,
 ]
 
 NODE_CLASS_MAPPINGS = {}
@@ -35,7 +35,7 @@ class FluxPro:
                 ),
                 "num_inference_steps": ("INT", {"default": 28, "min": 1, "max": 100}),
                 "guidance_scale": ("FLOAT", {"default": 3.5, "min": 0.0, "max": 20.0}),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 10}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "safety_tolerance": (["1", "2", "3", "4", "5", "6"], {"default": "2"}),
             },
             "optional": {
@@ -109,7 +109,7 @@ class FluxDev:
                 ),
                 "num_inference_steps": ("INT", {"default": 28, "min": 1, "max": 100}),
                 "guidance_scale": ("FLOAT", {"default": 3.5, "min": 0.0, "max": 20.0}),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 10}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "enable_safety_checker": ("BOOLEAN", {"default": True}),
             },
             "optional": {
@@ -182,7 +182,7 @@ class FluxSchnell:
                     {"default": 768, "min": 512, "max": 1536, "step": 32},
                 ),
                 "num_inference_steps": ("INT", {"default": 4, "min": 1, "max": 100}),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 10}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "enable_safety_checker": ("BOOLEAN", {"default": True}),
             },
             "optional": {
@@ -252,7 +252,7 @@ class FluxPro11:
                     "INT",
                     {"default": 768, "min": 512, "max": 1440, "step": 32},
                 ),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 10}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "safety_tolerance": (["1", "2", "3", "4", "5", "6"], {"default": "2"}),
             },
             "optional": {
@@ -304,7 +304,7 @@ class FluxUltra:
                     ["21:9", "16:9", "4:3", "1:1", "3:4", "9:16", "9:21"],
                     {"default": "16:9"},
                 ),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 1}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "safety_tolerance": (["1", "2", "3", "4", "5", "6"], {"default": "2"}),
                 "enable_safety_checker": ("BOOLEAN", {"default": True}),
                 "raw": ("BOOLEAN", {"default": False}),
@@ -378,7 +378,7 @@ class FluxLora:
                     "FLOAT",
                     {"default": 3.0, "min": 0.0, "max": 20.0, "step": 0.1},
                 ),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 4}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "enable_safety_checker": ("BOOLEAN", {"default": True}),
             },
             "optional": {
@@ -482,7 +482,7 @@ class FluxGeneral:
                     "FLOAT",
                     {"default": 3.3, "min": 0.0, "max": 5.0, "step": 0.1},
                 ),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 4}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "enable_safety_checker": ("BOOLEAN", {"default": False}),
                 "use_real_cfg": ("BOOLEAN", {"default": False}),
             },
@@ -748,7 +748,7 @@ class FluxProKontext:
                     "FLOAT",
                     {"default": 3.5, "min": 1.0, "max": 20.0, "step": 0.1},
                 ),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 4}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "safety_tolerance": (["1", "2", "3", "4", "5", "6"], {"default": "2"}),
                 "output_format": (["jpeg", "png"], {"default": "png"}),
                 "seed": ("INT", {"default": 0, "min": 0, "max": 2**32 - 1}),
@@ -835,7 +835,7 @@ class FluxProKontextMulti:
                     "FLOAT",
                     {"default": 3.5, "min": 1.0, "max": 20.0, "step": 0.1},
                 ),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 4}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "safety_tolerance": (["1", "2", "3", "4", "5", "6"], {"default": "2"}),
                 "output_format": (["jpeg", "png"], {"default": "png"}),
                 "seed": ("INT", {"default": 0, "min": 0, "max": 2**32 - 1}),
@@ -920,7 +920,7 @@ class FluxProKontextTextToImage:
                     "FLOAT",
                     {"default": 3.5, "min": 1.0, "max": 20.0, "step": 0.1},
                 ),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 4}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "safety_tolerance": (["1", "2", "3", "4", "5", "6"], {"default": "2"}),
                 "output_format": (["jpeg", "png"], {"default": "png"}),
                 "seed": ("INT", {"default": 0, "min": 0, "max": 2**32 - 1}),
@@ -35,7 +35,7 @@ class HidreamFull:
                 ),
                 "num_inference_steps": ("INT", {"default": 28, "min": 1, "max": 100}),
                 "guidance_scale": ("FLOAT", {"default": 3.5, "min": 0.0, "max": 20.0}),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 10}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "safety_tolerance": (["1", "2", "3", "4", "5", "6"], {"default": "2"}),
             },
             "optional": {
@@ -13,7 +13,7 @@ class NanoBanana:
                 "prompt": ("STRING", {"default": "", "multiline": True}),
             },
             "optional": {
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 4}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "output_format": (["jpeg", "png"], {"default": "png"}),
             },
         }
@@ -51,7 +51,7 @@ class NanoBananaEdit:
                 "image_2": ("IMAGE",),
                 "image_3": ("IMAGE",),
                 "image_4": ("IMAGE",),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 4}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "output_format": (["jpeg", "png"], {"default": "png"}),
             },
         }
@@ -41,7 +41,7 @@ class QwenImageTextToImage:
             "optional": {
                 "num_inference_steps": ("INT", {"default": 30, "min": 1, "max": 100}),
                 "guidance_scale": ("FLOAT", {"default": 4.0, "min": 0.0, "max": 20.0, "step": 0.1}),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 4}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "enable_safety_checker": ("BOOLEAN", {"default": True}),
                 "output_format": (_OUTPUT_FORMAT_CHOICES, {"default": "png"}),
                 "acceleration": (_ACCELERATION_CHOICES, {"default": "none"}),
@@ -108,7 +108,7 @@ class QwenImageImageToImage:
                 "image_strength": ("FLOAT", {"default": 0.8, "min": 0.0, "max": 1.0, "step": 0.05}),
                 "num_inference_steps": ("INT", {"default": 30, "min": 1, "max": 100}),
                 "guidance_scale": ("FLOAT", {"default": 4.0, "min": 0.0, "max": 20.0, "step": 0.1}),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 4}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "enable_safety_checker": ("BOOLEAN", {"default": True}),
                 "output_format": (_OUTPUT_FORMAT_CHOICES, {"default": "png"}),
                 "acceleration": (_ACCELERATION_CHOICES, {"default": "none"}),
@@ -183,7 +183,7 @@ class QwenImageEdit:
             "optional": {
                 "num_inference_steps": ("INT", {"default": 30, "min": 1, "max": 100}),
                 "guidance_scale": ("FLOAT", {"default": 4.0, "min": 0.0, "max": 20.0, "step": 0.1}),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 4}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "enable_safety_checker": ("BOOLEAN", {"default": True}),
                 "output_format": (_OUTPUT_FORMAT_CHOICES, {"default": "png"}),
                 "acceleration": (_ACCELERATION_CHOICES, {"default": "none"}),
@@ -257,7 +257,7 @@ class QwenImageEditInpaint:
             "optional": {
                 "num_inference_steps": ("INT", {"default": 30, "min": 1, "max": 100}),
                 "guidance_scale": ("FLOAT", {"default": 4.0, "min": 0.0, "max": 20.0, "step": 0.1}),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 4}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "enable_safety_checker": ("BOOLEAN", {"default": True}),
                 "output_format": (_OUTPUT_FORMAT_CHOICES, {"default": "png"}),
                 "acceleration": (_ACCELERATION_CHOICES, {"default": "none"}),
@@ -338,7 +338,7 @@ class QwenImageEditPlus:
                 "image_4": ("IMAGE",),
                 "num_inference_steps": ("INT", {"default": 30, "min": 1, "max": 100}),
                 "guidance_scale": ("FLOAT", {"default": 4.0, "min": 0.0, "max": 20.0, "step": 0.1}),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 4}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "enable_safety_checker": ("BOOLEAN", {"default": True}),
                 "output_format": (_OUTPUT_FORMAT_CHOICES, {"default": "png"}),
                 "acceleration": (_ACCELERATION_CHOICES, {"default": "none"}),
@@ -38,7 +38,7 @@ class Sana:
                     "FLOAT",
                     {"default": 5.0, "min": 1.0, "max": 20.0, "step": 0.1},
                 ),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 4}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
             },
             "optional": {
                 "negative_prompt": ("STRING", {"default": "", "multiline": True}),
@@ -24,7 +24,7 @@ class Seedream4TextToImage:
             "optional": {
                 "negative_prompt": ("STRING", {"default": "", "multiline": True}),
                 "seed": ("INT", {"default": -1, "min": -1, "max": 2147483647}),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 4}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "output_format": (["jpeg", "png"], {"default": "png"}),
             },
         }
@@ -86,7 +86,7 @@ class Seedream4ImageEdit:
                 ),
                 "negative_prompt": ("STRING", {"default": "", "multiline": True}),
                 "seed": ("INT", {"default": -1, "min": -1, "max": 2147483647}),
-                "num_images": ("INT", {"default": 1, "min": 1, "max": 4}),
+                "num_images": ("INT", {"default": 1, "min": 1, "max": 64}),
                 "output_format": (["jpeg", "png"], {"default": "png"}),
             },
         }
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+import torch.nn.functional as F
+
+from ..fal_utils import ResultProcessor
+
+
+def _can_supply(spec):
+    """Whether the sweep can fill an input: a widget default, a JSON value or the IMAGE input."""
+    input_type = spec[0]
+    options = spec[1] if len(spec) > 1 else {}
+    return (
+        isinstance(input_type, (list, tuple))
+        or input_type in ("IMAGE", "STRING", "INT", "FLOAT", "BOOLEAN")
+        or "default" in options
+    )
+
+
+def _sweepable_nodes():
+    """Registered image nodes that return an IMAGE, take a seed and need no unsupported input."""
+    from . import NODE_CLASS_MAPPINGS
+
+    names = []
+    for name, node_class in NODE_CLASS_MAPPINGS.items():
+        if node_class is ImageSweepNode or getattr(node_class, "RETURN_TYPES", ()) != ("IMAGE",):
+            continue
+        inputs = node_class.INPUT_TYPES()
+        required = inputs.get("required", {})
+        if "seed" not in {**required, **inputs.get("optional", {})}:
+            continue
+        if all(_can_supply(spec) for spec in required.values()):
+            names.append(name)
+    return names
+
+
+def _parse_seeds(text):
+    """Parse a comma/whitespace separated seed list; ``a..b`` expands to an inclusive range."""
+    seeds = []
+    for token in (text or "").replace(",", " ").split():
+        if ".." in token:
+            start, end = (int(part) for part in token.split("..", 1))
+            values = range(start, end + 1) if start <= end else range(start, end - 1, -1)
+        else:
+            values = [int(token)]
+        for value in values:
+            if value not in seeds:
+                seeds.append(value)
+    return seeds
+
+
+def _parse_variations(text):
+    """One JSON object of node inputs per non-empty line; no lines means a single row."""
+    variations = []
+    for line in (text or "").splitlines():
+        if not line.strip():
+            continue
+        variation = json.loads(line)
+        if not isinstance(variation, dict):
+            raise ValueError(f"Variation must be a JSON object: {line.strip()}")
+        variations.append(variation)
+    return variations or [{}]
+
+
+def _default_inputs(node_class, image, provided):
+    """Widget defaults for every input of ``node_class``; IMAGE inputs receive ``image``.
+
+    ``provided`` names the inputs every cell sets itself, so they need no default.
+    """
+    inputs = node_class.INPUT_TYPES()
+    kwargs = {}
+    for section in ("required", "optional"):
+        for name, spec in inputs.get(section, {}).items():
+            input_type = spec[0]
+            options = spec[1] if len(spec) > 1 else {}
+            if isinstance(input_type, (list, tuple)):
+                kwargs[name] = options.get("default", input_type[0] if input_type else None)
+            elif input_type == "IMAGE" and image is not None:
+                kwargs[name] = image
+            elif "default" in options:
+                kwargs[name] = options["default"]
+            elif section == "required" and name not in provided:
+                if input_type == "IMAGE":
+                    raise ValueError(f"Input '{name}' needs an image; connect the image input")
+                raise ValueError(f"Input '{name}' has no default; set it in base_inputs")
+    return kwargs
+
+
+def _fit_batch(images, height, width):
+    if tuple(images.shape[1:3]) == (height, width):
+        return images
+    return F.interpolate(
+        images.movedim(-1, 1),
+        size=(height, width),
+        mode="bilinear",
+        align_corners=False,
+        antialias=True,
+    ).movedim(1, -1).clamp(0.0, 1.0)
+
+
+class ImageSweepNode:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "model": (_sweepable_nodes(),),
+                "prompt": ("STRING", {"default": "", "multiline": True}),
+                "seeds": ("STRING", {"default": "0..7"}),
+                "variations": ("STRING", {"default": "", "multiline": True}),
+                "max_parallel": ("INT", {"default": 8, "min": 1, "max": 32}),
+            },
+            "optional": {
+                "base_inputs": ("STRING", {"default": "{}", "multiline": True}),
+                "image": ("IMAGE",),
+            },
+        }
+
+    RETURN_TYPES = ("IMAGE", "STRING")
+    RETURN_NAMES = ("images", "grid_labels")
+    FUNCTION = "run_sweep"
+    CATEGORY = "FAL/Image"
+
+    def run_sweep(
+        self,
+        model,
+        prompt,
+        seeds,
+        variations,
+        max_parallel,
+        base_inputs="{}",
+        image=None,
+    ):
+        from . import NODE_CLASS_MAPPINGS
+
+        node_class = NODE_CLASS_MAPPINGS[model]
+        try:
+            seed_list = _parse_seeds(seeds) or [-1]
+            rows = _parse_variations(variations)
+            base = json.loads(base_inputs or "{}")
+            if not isinstance(base, dict):
+                raise ValueError("base_inputs must be a JSON object")
+            # Inputs set by base_inputs or by every variation need no default
+            provided = set(base).union(set.intersection(*(set(row) for row in rows)))
+            defaults = _default_inputs(node_class, image, provided)
+        except ValueError as e:
+            print(f"Error in {model} sweep: {str(e)}")
+            return (ResultProcessor.create_blank_image()[0], "")
+
+        if prompt:
+            defaults["prompt"] = prompt
+        # Grid order: one row per variation, one column per seed
+        cells = [
+            {**defaults, **base, **row, "seed": seed} for row in rows for seed in seed_list
+        ]
+
+        def generate(kwargs):
+            try:
+                return getattr(node_class(), node_class.FUNCTION)(**kwargs)[0]
+            except Exception as e:
+                print(f"Error in {model} sweep cell (seed {kwargs['seed']}): {str(e)}")
+                return ResultProcessor.create_blank_image()[0]
+
+        with ThreadPoolExecutor(max_workers=min(max_parallel, len(cells))) as executor:
+            results = list(executor.map(generate, cells))
+
+        # Failed cells come back as blank placeholders, so the grid keeps its shape
+        sizes = [tuple(int(dim) for dim in result.shape[1:3]) for result in results]
+        height, width = max(set(sizes), key=sizes.count)
+        images = torch.cat([_fit_batch(result, height, width) for result in results], dim=0)
+        # One label per returned image, so cells with num_images > 1 repeat theirs
+        cell_labels = [
+            " ".join(f"{key}={value}" for key, value in {**row, "seed": seed}.items())
+            for row in rows
+            for seed in seed_list
+        ]
+        labels = [
+            label
+            for label, result in zip(cell_labels, results)
+            for _ in range(int(result.shape[0]))
+        ]
+        return (images, "\n".join(labels))
+
+
+NODE_CLASS_MAPPINGS = {
+    "ImageSweep_fal": ImageSweepNode,
+}
+
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "ImageSweep_fal": "Image Seed Sweep (fal)",
+}
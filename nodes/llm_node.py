@@ -1,4 +1,117 @@
-from .fal_utils import ApiHandler
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .fal_utils import TEXT_CACHE_MODES, ApiHandler, FalAPIError, TextResponseCache
+
+try:
+    from server import PromptServer
+except ImportError:  # Outside ComfyUI there is no UI to stream partial text to
+    PromptServer = None
+
+# Minimum seconds between partial-text pushes so long streams do not flood the websocket
+_STREAM_UI_INTERVAL = 0.1
+
+LLM_MODELS = [
+    "google/gemini-2.0-flash-001",
+    "google/gemini-2.5-flash",
+    "google/gemini-2.5-flash-lite",
+    "google/gemini-2.5-pro",
+    "anthropic/claude-3-5-haiku",
+    "anthropic/claude-3.5-sonnet",
+    "anthropic/claude-3.7-sonnet",
+    "anthropic/claude-3-haiku",
+    "deepseek/deepseek-r1",
+    "openai/gpt-4o",
+    "openai/gpt-4o-mini",
+    "openai/gpt-4.1",
+    "openai/gpt-5-chat",
+    "openai/gpt-5-mini",
+    "openai/gpt-5-nano",
+    "openai/gpt-oss-120b",
+    "openai/o3",
+]
+
+_GENERATION_INPUTS = {
+    "reasoning": ("BOOLEAN", {"default": False}),
+    "priority": (
+        ["throughput", "latency"],
+        {"default": "latency"},
+    ),
+    "temperature": (
+        "FLOAT",
+        {"default": 0.7, "min": 0.0, "max": 2.0, "step": 0.1},
+    ),
+    "max_tokens": (
+        "INT",
+        {"default": 1024, "min": 1, "max": 32768, "step": 1},
+    ),
+    # auto caches only deterministic (temperature 0) requests
+    "cache_mode": (TEXT_CACHE_MODES, {"default": "auto"}),
+}
+
+
+def build_llm_arguments(
+    prompt, model, system_prompt, reasoning, priority, temperature, max_tokens
+):
+    arguments = {
+        "model": model,
+        "prompt": prompt,
+        "system_prompt": system_prompt,
+    }
+
+    if reasoning:
+        arguments["reasoning"] = reasoning
+
+    if priority:
+        arguments["priority"] = priority
+
+    if temperature is not None:
+        arguments["temperature"] = float(temperature)
+
+    if max_tokens is not None and max_tokens > 0:
+        arguments["max_tokens"] = int(max_tokens)
+
+    return arguments
+
+
+def _cache_key(endpoint, arguments, cache_mode):
+    if not TextResponseCache.should_cache(cache_mode, arguments.get("temperature")):
+        return None
+    return TextResponseCache.make_key(endpoint, arguments)
+
+
+def _ui_text_sender(node_id):
+    """Return a callback that shows partial text on the node, or None outside ComfyUI."""
+    if PromptServer is None or node_id is None:
+        return None
+    server = PromptServer.instance
+    last_sent = [0.0]
+
+    def send(text, final=False):
+        now = time.monotonic()
+        if not final and now - last_sent[0] < _STREAM_UI_INTERVAL:
+            return
+        last_sent[0] = now
+        if hasattr(server, "send_progress_text"):
+            server.send_progress_text(text, node_id)
+        else:
+            server.send_sync("fal.llm.stream", {"node": node_id, "text": text})
+
+    return send
+
+
+def parse_prompt_list(prompts):
+    """Accept a JSON list of strings or one prompt per non-empty line."""
+    text = (prompts or "").strip()
+    if text.startswith("["):
+        try:
+            items = json.loads(text)
+        except ValueError:
+            items = None
+        if isinstance(items, list):
+            return [str(item) for item in items]
+    return [line.strip() for line in text.splitlines() if line.strip()]
 
 
 class LLMNode:
@@ -7,45 +120,14 @@ class LLMNode:
         return {
             "required": {
                 "prompt": ("STRING", {"default": "", "multiline": True}),
-                "model": (
-                    [
-                        "google/gemini-2.0-flash-001",
-                        "google/gemini-2.5-flash",
-                        "google/gemini-2.5-flash-lite",
-                        "google/gemini-2.5-pro",
-                        "anthropic/claude-3-5-haiku",
-                        "anthropic/claude-3.5-sonnet",
-                        "anthropic/claude-3.7-sonnet",
-                        "anthropic/claude-3-haiku",
-                        "deepseek/deepseek-r1",
-                        "openai/gpt-4o",
-                        "openai/gpt-4o-mini",
-                        "openai/gpt-4.1",
-                        "openai/gpt-5-chat",
-                        "openai/gpt-5-mini",
-                        "openai/gpt-5-nano",
-                        "openai/gpt-oss-120b",
-                        "openai/o3",
-                    ],
-                    {"default": "google/gemini-2.0-flash-001"},
-                ),
+                "model": (LLM_MODELS, {"default": "google/gemini-2.0-flash-001"}),
                 "system_prompt": ("STRING", {"default": "", "multiline": True}),
             },
             "optional": {
-                "reasoning": ("BOOLEAN", {"default": False}),
-                "priority": (
-                    ["throughput", "latency"],
-                    {"default": "latency"},
-                ),
-                "temperature": (
-                    "FLOAT",
-                    {"default": 0.7, "min": 0.0, "max": 2.0, "step": 0.1},
-                ),
-                "max_tokens": (
-                    "INT",
-                    {"default": 1024, "min": 1, "max": 32768, "step": 1},
-                ),
+                **_GENERATION_INPUTS,
+                "stream": ("BOOLEAN", {"default": False}),
             },
+            "hidden": {"unique_id": "UNIQUE_ID"},
         }
 
     RETURN_TYPES = ("STRING",)
@@ -61,34 +143,185 @@ class LLMNode:
         priority="latency",
         temperature=0.7,
         max_tokens=1024,
+        cache_mode="auto",
+        stream=False,
+        unique_id=None,
     ):
-        arguments = {
-            "model": model,
-            "prompt": prompt,
-            "system_prompt": system_prompt,
+        arguments = build_llm_arguments(
+            prompt, model, system_prompt, reasoning, priority, temperature, max_tokens
+        )
+        send_partial = _ui_text_sender(unique_id) if stream else None
+        result = ApiHandler.run_text_job(
+            model,
+            "fal-ai/any-llm",
+            arguments,
+            _cache_key("fal-ai/any-llm", arguments, cache_mode),
+            stream,
+            send_partial,
+        )
+        if send_partial is not None:
+            # The throttle may have skipped the last chunk, so always show the final text
+            send_partial(result[0], final=True)
+        return result
+
+
+class LLMBatchNode:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "prompts": ("STRING", {"default": "", "multiline": True}),
+                "model": (LLM_MODELS, {"default": "google/gemini-2.0-flash-001"}),
+                "system_prompt": ("STRING", {"default": "", "multiline": True}),
+                "max_parallel": ("INT", {"default": 8, "min": 1, "max": 64}),
+            },
+            "optional": dict(_GENERATION_INPUTS),
         }
 
-        if reasoning:
-            arguments["reasoning"] = reasoning
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("texts", "results_json")
+    OUTPUT_IS_LIST = (True, False)
+    FUNCTION = "generate_batch"
+    CATEGORY = "FAL/LLM"
 
-        if priority:
-            arguments["priority"] = priority
+    @staticmethod
+    def _generate_one(model, arguments, cache_key):
+        try:
+            return {
+                "output": ApiHandler.generate_text("fal-ai/any-llm", arguments, cache_key)
+            }
+        except Exception as e:
+            message = e.message if isinstance(e, FalAPIError) else str(e)
+            print(f"Error generating text with {model}: {message}")
+            return {"output": "", "error": message}
 
-        if temperature is not None:
-            arguments["temperature"] = float(temperature)
+    def generate_batch(
+        self,
+        prompts,
+        model,
+        system_prompt,
+        max_parallel,
+        reasoning=False,
+        priority="latency",
+        temperature=0.7,
+        max_tokens=1024,
+        cache_mode="auto",
+    ):
+        prompt_list = parse_prompt_list(prompts)
+        if not prompt_list:
+            return ([], json.dumps([]))
+
+        argument_list = [
+            build_llm_arguments(
+                prompt, model, system_prompt, reasoning, priority, temperature, max_tokens
+            )
+            for prompt in prompt_list
+        ]
+
+        # Results come back in input order; a failed prompt only empties its own slot
+        with ThreadPoolExecutor(max_workers=min(max_parallel, len(prompt_list))) as executor:
+            futures = [
+                executor.submit(
+                    self._generate_one,
+                    model,
+                    arguments,
+                    _cache_key("fal-ai/any-llm", arguments, cache_mode),
+                )
+                for arguments in argument_list
+            ]
+            results = [
+                {"prompt": prompt, **future.result()}
+                for prompt, future in zip(prompt_list, futures)
+            ]
+
+        texts = [result["output"] for result in results]
+        return (texts, json.dumps(results, indent=2))
+
+
+class LLMRaceNode:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "prompt": ("STRING", {"default": "", "multiline": True}),
+                "model": (LLM_MODELS, {"default": "google/gemini-2.0-flash-001"}),
+                "system_prompt": ("STRING", {"default": "", "multiline": True}),
+                "race_mode": (["hedge", "race"], {"default": "hedge"}),
+                "backup_models": (
+                    "STRING",
+                    {"default": "google/gemini-2.5-flash-lite, openai/gpt-4o-mini"},
+                ),
+            },
+            "optional": {
+                **{
+                    key: value
+                    for key, value in _GENERATION_INPUTS.items()
+                    if key != "cache_mode"
+                },
+                # 0 hedges after each model's measured p90 latency
+                "hedge_after_seconds": (
+                    "FLOAT",
+                    {"default": 0.0, "min": 0.0, "max": 600.0, "step": 0.5},
+                ),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("text", "answered_by")
+    FUNCTION = "generate_text"
+    CATEGORY = "FAL/LLM"
+
+    def generate_text(
+        self,
+        prompt,
+        model,
+        system_prompt,
+        race_mode,
+        backup_models,
+        reasoning=False,
+        priority="latency",
+        temperature=0.7,
+        max_tokens=1024,
+        hedge_after_seconds=0.0,
+    ):
+        models = [model]
+        for name in backup_models.replace(",", " ").split():
+            if name not in models:
+                models.append(name)
 
-        if max_tokens is not None and max_tokens > 0:
-            arguments["max_tokens"] = int(max_tokens)
+        # race starts every model at once; hedge adds the next model once the
+        # previous one has run longer than its usual (p90) latency
+        delays = [0.0]
+        for previous in models[:-1]:
+            if race_mode == "race":
+                delays.append(0.0)
+            else:
+                step = hedge_after_seconds or ApiHandler.hedge_delay(previous)
+                delays.append(delays[-1] + step)
 
-        return ApiHandler.run_text_job(model, "fal-ai/any-llm", arguments)
+        candidates = [
+            build_llm_arguments(
+                prompt, name, system_prompt, reasoning, priority, temperature, max_tokens
+            )
+            for name in models
+        ]
+        try:
+            winner, output = ApiHandler.race_text_jobs("fal-ai/any-llm", candidates, delays)
+        except Exception as e:
+            return ApiHandler.handle_text_generation_error(model, e) + ("",)
+        return (output, winner)
 
 
 # Node class mappings
 NODE_CLASS_MAPPINGS = {
     "LLM_fal": LLMNode,
+    "LLMBatch_fal": LLMBatchNode,
+    "LLMRace_fal": LLMRaceNode,
 }
 
 # Node display name mappings
 NODE_DISPLAY_NAME_MAPPINGS = {
     "LLM_fal": "LLM (fal)",
+    "LLMBatch_fal": "LLM Batch (fal)",
+    "LLMRace_fal": "LLM Race (fal)",
 }
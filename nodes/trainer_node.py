@@ -1,51 +1,479 @@
+import hashlib
+import io
+import itertools
+import json
 import os
 import tempfile
+import threading
+import time
 import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import torch
+import torch.nn.functional as F
 from PIL import Image
 
-from .fal_utils import ApiHandler, FalConfig
+from .fal_utils import (
+    ApiHandler,
+    ChunkedUploadWriter,
+    FalAPIError,
+    FalConfig,
+    FalJobTimeoutError,
+    VideoUtils,
+    atomic_write_json,
+)
 
 # Initialize FalConfig
 fal_config = FalConfig()
 
+# PNG encoding releases the GIL, so archive entries are encoded on a thread pool
+_ARCHIVE_WORKERS = int(os.getenv("FAL_ARCHIVE_WORKERS", str(min(8, os.cpu_count() or 1))))
 
-def create_zip_from_images(images):
-    """Create a zip file from a list of images."""
+# Each clip encode is already multi-threaded, so only a few run side by side
+_VIDEO_ARCHIVE_WORKERS = int(os.getenv("FAL_VIDEO_ARCHIVE_WORKERS", "2"))
+
+# Uploaded datasets are remembered by content so retraining with new hyperparameters skips the upload
+_DATASET_CACHE_PATH = os.getenv(
+    "FAL_DATASET_CACHE_PATH",
+    os.path.join(tempfile.gettempdir(), "comfyui-fal-dataset-cache.json"),
+)
+_DATASET_CACHE_TTL_SECONDS = float(os.getenv("FAL_DATASET_CACHE_TTL_HOURS", "24")) * 3600
+_DATASET_CACHE_MAX_ENTRIES = 256
+# Submitted training jobs are persisted so their LoRAs can be collected in a later run
+_TRAINING_JOBS_PATH = os.getenv(
+    "FAL_TRAINING_JOBS_PATH",
+    os.path.join(tempfile.gettempdir(), "comfyui-fal-training-jobs.json"),
+)
+# Finished jobs are forgotten after this long; the store never holds more than the max entries
+_TRAINING_JOBS_TTL_SECONDS = float(os.getenv("FAL_TRAINING_JOBS_TTL_DAYS", "7")) * 86400
+_TRAINING_JOBS_MAX_ENTRIES = 512
+# Fixed entry timestamp keeps archives byte-identical across rebuilds, so uploads can resume
+_ARCHIVE_ENTRY_DATE = (1980, 1, 1, 0, 0, 0)
+# Bump whenever the archive layout changes so stale uploads are not reused
+_ARCHIVE_FORMAT_VERSION = 1
+# Images resized together in one batched interpolate call during preprocessing
+_PREPROCESS_CHUNK = 8
+PREPROCESS_MODES = ["none", "resize", "center_crop"]
+
+
+def _image_to_png_bytes(img_tensor):
+    """Encode one image tensor (or PIL image) as PNG bytes."""
+    if isinstance(img_tensor, torch.Tensor):
+        # Convert to numpy and scale to 0-255 range
+        img_np = (img_tensor.cpu().numpy() * 255).astype("uint8")
+        # Handle different tensor formats
+        if img_np.shape[0] == 3:  # If in format (C, H, W)
+            img_np = img_np.transpose(1, 2, 0)
+        img = Image.fromarray(img_np)
+    else:
+        img = img_tensor
+
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _iter_parallel(func, items, workers):
+    """Map func over items on a thread pool, yielding results in input order.
+
+    Only a bounded number of results are kept in flight so large datasets do not
+    pile up in memory ahead of the consumer.
+    """
+    workers = max(1, workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _write_archive_entry(zf, name, data):
+    zf.writestr(zipfile.ZipInfo(name, date_time=_ARCHIVE_ENTRY_DATE), data)
+
+
+def write_image_archive(images, sink):
+    """Write images as PNG entries of an uncompressed zip archive into a file object."""
+    # PNG data is already deflated, so storing entries avoids compressing twice
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as zf:
+        for idx, png_bytes in enumerate(
+            _iter_parallel(_image_to_png_bytes, images, _ARCHIVE_WORKERS)
+        ):
+            _write_archive_entry(zf, f"image_{idx}.png", png_bytes)
+
+
+def _downscale_batch(batch, preprocess, resolution):
+    """Downscale an (N, H, W, C) batch so it fits the trainer resolution.
+
+    ``resize`` bounds the longest side by ``resolution``; ``center_crop`` scales the
+    shortest side to ``resolution`` and crops the centre square. Images are never upscaled.
+    """
+    height, width = batch.shape[1:3]
+    side = max(height, width) if preprocess == "resize" else min(height, width)
+    scale = resolution / side
+    if scale < 1.0:
+        size = (max(1, round(height * scale)), max(1, round(width * scale)))
+        batch = F.interpolate(
+            batch.permute(0, 3, 1, 2).float(),
+            size=size,
+            mode="bilinear",
+            align_corners=False,
+            antialias=True,
+        ).permute(0, 2, 3, 1)
+        height, width = size
+
+    if preprocess == "center_crop":
+        crop_h, crop_w = min(height, resolution), min(width, resolution)
+        top, left = (height - crop_h) // 2, (width - crop_w) // 2
+        batch = batch[:, top : top + crop_h, left : left + crop_w]
+    return batch.clamp(0.0, 1.0)
+
+
+def preprocess_images(images, preprocess, resolution):
+    """Lazily yield images downscaled for training, resizing chunks of the batch at once."""
+    if isinstance(images, torch.Tensor) and images.dim() == 4:
+        for start in range(0, images.shape[0], _PREPROCESS_CHUNK):
+            chunk = images[start : start + _PREPROCESS_CHUNK]
+            yield from _downscale_batch(chunk, preprocess, resolution).cpu()
+        return
+
+    for img in images:
+        if isinstance(img, torch.Tensor) and img.dim() == 3 and img.shape[-1] in (1, 3, 4):
+            yield _downscale_batch(img.unsqueeze(0), preprocess, resolution)[0].cpu()
+        else:
+            yield img
+
+
+def upload_archive(write_archive, file_name, key):
+    """Stream an archive into a chunked upload that can resume under ``key``.
+
+    Archives are byte-identical when rebuilt from the same data, so after an interruption
+    the archive is rebuilt in memory and only the parts that never finished are sent.
+    """
+    client = FalConfig().get_client()
+    for attempt in range(2):
+        writer = ChunkedUploadWriter(client, file_name, "application/zip", resume_key=key)
+        try:
+            write_archive(writer)
+            return writer.finish()
+        except Exception as e:
+            writer.abort()
+            # A resumed upload the backend has forgotten is rebuilt once from scratch
+            if attempt or not writer.discard_resume(e):
+                raise
+
+
+def create_zip_from_images(images, preprocess="none", resolution=1024, fingerprint=None):
+    """Build a zip archive from a list of images and upload it, returning the URL."""
     try:
-        with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as temp_zip:
-            with zipfile.ZipFile(temp_zip, "w") as zf:
-                for idx, img_tensor in enumerate(images):
-                    # Convert tensor to PIL Image
-                    if isinstance(img_tensor, torch.Tensor):
-                        # Convert to numpy and scale to 0-255 range
-                        img_np = (img_tensor.cpu().numpy() * 255).astype("uint8")
-                        # Handle different tensor formats
-                        if img_np.shape[0] == 3:  # If in format (C, H, W)
-                            img_np = img_np.transpose(1, 2, 0)
-                        img = Image.fromarray(img_np)
-                    else:
-                        img = img_tensor
-
-                    # Save image to temporary file
-                    with tempfile.NamedTemporaryFile(
-                        suffix=".png", delete=False
-                    ) as temp_img:
-                        img.save(temp_img, format="PNG")
-                        temp_img_path = temp_img.name
-
-                    # Add to zip file
-                    zf.write(temp_img_path, f"image_{idx}.png")
-                    os.unlink(temp_img_path)
-
-            # Use fal_client.upload_file instead of ApiHandler.upload_file
-            client = FalConfig().get_client()
-            return client.upload_file(temp_zip.name)
+        if fingerprint is None:
+            fingerprint = dataset_fingerprint(images, preprocess, resolution)
+
+        def write_archive(sink):
+            # Preprocessing is lazy, so every rebuild starts again from the source images
+            source = images
+            if preprocess != "none":
+                source = preprocess_images(images, preprocess, resolution)
+            write_image_archive(source, sink)
+
+        return upload_archive(write_archive, "images.zip", fingerprint)
     except Exception as e:
-        return ApiHandler.handle_text_generation_error(
+        ApiHandler.handle_text_generation_error(
             "flux-lora-fast-training", f"Failed to create zip file: {str(e)}"
         )
+        return None
+
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def dataset_fingerprint(images, preprocess="none", resolution=None):
+    """Hash the exact pixel content of an image batch together with the archive format."""
+    tag = f"archive-v{_ARCHIVE_FORMAT_VERSION}"
+    if preprocess != "none":
+        tag += f":{preprocess}:{resolution}"
+    digest = hashlib.sha256(tag.encode("utf-8"))
+    for img in images:
+        if isinstance(img, torch.Tensor):
+            array = img.detach().cpu().contiguous().numpy()
+        else:
+            array = np.ascontiguousarray(np.asarray(img))
+        digest.update(repr((array.shape, array.dtype.str)).encode("utf-8"))
+        digest.update(memoryview(array).cast("B"))
+    return digest.hexdigest()
+
+
+class UploadedDatasetCache:
+    """Persistent map from dataset fingerprint to the URL of its uploaded archive."""
+
+    def __init__(self, path, ttl_seconds, max_entries):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint):
+        with self._lock:
+            entry = _read_json(self.path).get(fingerprint)
+        if not isinstance(entry, dict) or not entry.get("url"):
+            return None
+        # Uploaded files are not kept forever, so old entries are treated as misses
+        if time.time() - float(entry.get("created", 0)) > self.ttl_seconds:
+            return None
+        return entry["url"]
+
+    def put(self, fingerprint, url):
+        with self._lock:
+            entries = _read_json(self.path)
+            entries[fingerprint] = {"url": url, "created": time.time()}
+            now = time.time()
+            fresh = [
+                (key, value)
+                for key, value in entries.items()
+                if isinstance(value, dict)
+                and now - float(value.get("created", 0)) <= self.ttl_seconds
+            ]
+            fresh.sort(key=lambda item: item[1]["created"])
+            entries = dict(fresh[-self.max_entries :])
+
+            try:
+                atomic_write_json(self.path, entries)
+            except OSError as e:
+                print(f"Warning: failed to persist dataset upload cache: {str(e)}")
+
+
+_DATASET_CACHE = UploadedDatasetCache(
+    _DATASET_CACHE_PATH, _DATASET_CACHE_TTL_SECONDS, _DATASET_CACHE_MAX_ENTRIES
+)
+
+
+def upload_image_dataset(images, reuse_uploaded=True, preprocess="none", resolution=1024):
+    """Upload images as a training archive, reusing an earlier upload of identical images."""
+    # Also keys the on-disk archive, so interrupted uploads resume even without reuse
+    fingerprint = dataset_fingerprint(images, preprocess, resolution)
+    if reuse_uploaded:
+        cached_url = _DATASET_CACHE.get(fingerprint)
+        if cached_url:
+            print(f"Reusing uploaded training dataset: {cached_url}")
+            return cached_url
+
+    url = create_zip_from_images(images, preprocess, resolution, fingerprint)
+    if url and reuse_uploaded:
+        _DATASET_CACHE.put(fingerprint, url)
+    return url
+
+
+def _split_clips(video_frames, frames_per_clip):
+    if video_frames is None:
+        return []
+    if frames_per_clip <= 0:
+        return [video_frames]
+    return [
+        video_frames[start : start + frames_per_clip]
+        for start in range(0, video_frames.shape[0], frames_per_clip)
+    ]
+
+
+def _match_captions(captions, count):
+    """One caption per line in item order; a single line captions every item."""
+    lines = [line.strip() for line in (captions or "").splitlines() if line.strip()]
+    if len(lines) == 1:
+        return lines * count
+    if lines and len(lines) != count:
+        print(
+            f"Warning: {len(lines)} captions for {count} training items; "
+            "unmatched items are left uncaptioned"
+        )
+    return (lines + [""] * count)[:count]
+
+
+def write_media_archive(images, clips, captions, fps, sink):
+    """Write stills as PNG and clips as MP4, each with an optional caption file, into a zip."""
+    images = images if images is not None else []
+    captions = _match_captions(captions, len(images) + len(clips))
+    encoded = itertools.chain(
+        (
+            ("image", "png", data)
+            for data in _iter_parallel(_image_to_png_bytes, images, _ARCHIVE_WORKERS)
+        ),
+        (
+            ("video", "mp4", data)
+            for data in _iter_parallel(
+                lambda clip: VideoUtils.encode_video(clip, fps), clips, _VIDEO_ARCHIVE_WORKERS
+            )
+        ),
+    )
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as zf:
+        for idx, ((kind, ext, payload), caption) in enumerate(zip(encoded, captions)):
+            name = f"{kind}_{idx:04d}"
+            _write_archive_entry(zf, f"{name}.{ext}", payload)
+            if caption:
+                _write_archive_entry(zf, f"{name}.txt", caption)
+
+
+def upload_media_dataset(
+    model_name, images, video_frames, frames_per_clip, captions, fps, reuse_uploaded=True
+):
+    """Build and upload a captioned image/video training archive, returning its URL."""
+    clips = _split_clips(video_frames, frames_per_clip)
+    digest = hashlib.sha256(f"media:{fps}:{frames_per_clip}:{captions}".encode("utf-8"))
+    for part in (images, video_frames):
+        if part is not None:
+            digest.update(dataset_fingerprint(part).encode("utf-8"))
+    fingerprint = digest.hexdigest()
+    if reuse_uploaded:
+        cached_url = _DATASET_CACHE.get(fingerprint)
+        if cached_url:
+            print(f"Reusing uploaded training dataset: {cached_url}")
+            return cached_url
+
+    try:
+        url = upload_archive(
+            lambda sink: write_media_archive(images, clips, captions, fps, sink),
+            "training_data.zip",
+            fingerprint,
+        )
+    except Exception as e:
+        ApiHandler.handle_text_generation_error(
+            model_name, f"Failed to create training archive: {str(e)}"
+        )
+        return None
+
+    if url and reuse_uploaded:
+        _DATASET_CACHE.put(fingerprint, url)
+    return url
+
+
+class TrainingJobStore:
+    """Persistent record of submitted training jobs, keyed by request id.
+
+    Finished jobs older than ``ttl_seconds`` are pruned on every update, and the store is
+    capped at ``max_entries``, dropping the oldest finished jobs before any pending one.
+    """
+
+    _FINISHED = ("COMPLETED", "FAILED")
+
+    def __init__(self, path, ttl_seconds, max_entries):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, request_id):
+        with self._lock:
+            entry = _read_json(self.path).get(request_id)
+        return entry if isinstance(entry, dict) else None
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            jobs = _read_json(self.path)
+            entry = jobs.get(job_id) if isinstance(jobs.get(job_id), dict) else {}
+            entry.update(fields)
+            if entry.get("status") in self._FINISHED:
+                entry.setdefault("finished_at", time.time())
+            jobs[job_id] = entry
+            jobs = self._prune(jobs)
+            try:
+                atomic_write_json(self.path, jobs)
+            except OSError as e:
+                print(f"Warning: failed to persist training job {job_id}: {str(e)}")
+        return entry
+
+    def _prune(self, jobs):
+        now = time.time()
+        kept = []
+        for key, entry in jobs.items():
+            if not isinstance(entry, dict):
+                continue
+            finished = entry.get("status") in self._FINISHED
+            finished_at = float(entry.get("finished_at") or entry.get("submitted_at") or 0)
+            if finished and now - finished_at > self.ttl_seconds:
+                continue
+            kept.append((not finished, float(entry.get("submitted_at") or 0), key, entry))
+        # Pending jobs sort after finished ones, so the cap drops old finished jobs first
+        kept.sort(key=lambda item: item[:2])
+        return {key: entry for _, _, key, entry in kept[-self.max_entries :]}
+
+
+_TRAINING_JOBS = TrainingJobStore(
+    _TRAINING_JOBS_PATH, _TRAINING_JOBS_TTL_SECONDS, _TRAINING_JOBS_MAX_ENTRIES
+)
+
+
+def parse_job_handle(job_handle):
+    """Accept a JSON job handle or a bare request id of a job recorded in the store."""
+    job_handle = (job_handle or "").strip()
+    if not job_handle:
+        raise ValueError("job_handle is required")
+    try:
+        handle = json.loads(job_handle)
+    except ValueError:
+        handle = None
+    if isinstance(handle, dict) and handle.get("request_id") and handle.get("endpoint"):
+        return handle
+
+    entry = _TRAINING_JOBS.get(job_handle)
+    if entry is None:
+        raise ValueError(f"Unknown training job: {job_handle}")
+    handle = {key: entry.get(key) for key in ("endpoint", "result_key", "model_name")}
+    return {**handle, "request_id": job_handle}
+
+
+def submit_training_job(model_name, endpoint, arguments, result_key):
+    """Queue a training job, record it in the job store and return its handle."""
+    request_id = ApiHandler.submit_job(endpoint, arguments)
+    handle = {
+        "endpoint": endpoint,
+        "request_id": request_id,
+        "result_key": result_key,
+        "model_name": model_name,
+    }
+    _TRAINING_JOBS.update(request_id, submitted_at=time.time(), status="SUBMITTED", **handle)
+    return handle
+
+
+def await_training_job(handle):
+    """Wait for a submitted training job without a deadline and return its LoRA URL.
+
+    Training routinely outlasts the generic job timeout, and timing out would cancel it.
+    """
+    request_id = handle["request_id"]
+    try:
+        result = ApiHandler.get_job_result(handle["endpoint"], request_id, timeout=None)
+        lora_url = result[handle["result_key"]]["url"]
+    except Exception:
+        _TRAINING_JOBS.update(request_id, status="FAILED")
+        raise
+    _TRAINING_JOBS.update(request_id, status="COMPLETED", lora_file_url=lora_url)
+    return lora_url
+
+
+def run_training_job(model_name, endpoint, arguments, result_key, submit_only=False):
+    """Run a training job to completion, or only queue it and return a job handle.
+
+    Returns ``(lora_file_url, job_handle)``; the URL is empty for submit-only jobs.
+    Blocking runs wait without a deadline, since training outlasts the generic job timeout.
+    """
+    if submit_only:
+        handle = submit_training_job(model_name, endpoint, arguments, result_key)
+        return ("", json.dumps(handle))
+
+    handle = submit_training_job(model_name, endpoint, arguments, result_key)
+    return (await_training_job(handle), json.dumps(handle))
+
+
+def _training_error(model_name, error):
+    return ApiHandler.handle_text_generation_error(model_name, error) + ("",)
 
 
 class FluxLoraTrainerNode:
@@ -66,11 +494,18 @@ class FluxLoraTrainerNode:
                 "images_zip_url": ("STRING", {"default": ""}),
                 "is_input_format_already_preprocessed": ("BOOLEAN", {"default": False}),
                 "data_archive_format": ("STRING", {"default": ""}),
+                "reuse_uploaded_dataset": ("BOOLEAN", {"default": True}),
+                "preprocess": (PREPROCESS_MODES, {"default": "none"}),
+                "preprocess_resolution": (
+                    "INT",
+                    {"default": 1024, "min": 256, "max": 4096, "step": 64},
+                ),
+                "submit_only": ("BOOLEAN", {"default": False}),
             },
         }
 
-    RETURN_TYPES = ("STRING",)
-    RETURN_NAMES = ("lora_file_url",)
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("lora_file_url", "job_handle")
     FUNCTION = "train_lora"
     CATEGORY = "FAL/Training"
 
@@ -84,14 +519,22 @@ class FluxLoraTrainerNode:
         images_zip_url="",
         is_input_format_already_preprocessed=False,
         data_archive_format="",
+        reuse_uploaded_dataset=True,
+        submit_only=False,
+        preprocess="none",
+        preprocess_resolution=1024,
     ):
         try:
             # Use provided zip URL if available, otherwise create and upload zip file
             images_url = (
-                images_zip_url if images_zip_url else create_zip_from_images(images)
+                images_zip_url
+                if images_zip_url
+                else upload_image_dataset(
+                    images, reuse_uploaded_dataset, preprocess, preprocess_resolution
+                )
             )
             if not images_url:
-                return ApiHandler.handle_text_generation_error(
+                return _training_error(
                     "flux-lora-fast-training", "Failed to upload images"
                 )
 
@@ -111,14 +554,16 @@ class FluxLoraTrainerNode:
                 arguments["data_archive_format"] = data_archive_format
 
             # Submit training job
-            result = ApiHandler.submit_and_get_result(
-                "fal-ai/flux-lora-fast-training", arguments
+            return run_training_job(
+                "flux-lora-fast-training",
+                "fal-ai/flux-lora-fast-training",
+                arguments,
+                "diffusers_lora_file",
+                submit_only,
             )
-            lora_url = result["diffusers_lora_file"]["url"]
-            return (lora_url,)
 
         except Exception as e:
-            return ApiHandler.handle_text_generation_error(
+            return _training_error(
                 "flux-lora-fast-training", str(e)
             )
 
@@ -143,11 +588,18 @@ class HunyuanVideoLoraTrainerNode:
                 "do_caption": ("BOOLEAN", {"default": True}),
                 "images_zip_url": ("STRING", {"default": ""}),
                 "data_archive_format": ("STRING", {"default": ""}),
+                "reuse_uploaded_dataset": ("BOOLEAN", {"default": True}),
+                "preprocess": (PREPROCESS_MODES, {"default": "none"}),
+                "preprocess_resolution": (
+                    "INT",
+                    {"default": 1024, "min": 256, "max": 4096, "step": 64},
+                ),
+                "submit_only": ("BOOLEAN", {"default": False}),
             },
         }
 
-    RETURN_TYPES = ("STRING",)
-    RETURN_NAMES = ("lora_file_url",)
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("lora_file_url", "job_handle")
     FUNCTION = "train_lora"
     CATEGORY = "FAL/Training"
 
@@ -160,14 +612,22 @@ class HunyuanVideoLoraTrainerNode:
         do_caption=True,
         images_zip_url="",
         data_archive_format="",
+        reuse_uploaded_dataset=True,
+        submit_only=False,
+        preprocess="none",
+        preprocess_resolution=1024,
     ):
         try:
             # Use provided zip URL if available, otherwise create and upload zip file
             images_url = (
-                images_zip_url if images_zip_url else create_zip_from_images(images)
+                images_zip_url
+                if images_zip_url
+                else upload_image_dataset(
+                    images, reuse_uploaded_dataset, preprocess, preprocess_resolution
+                )
             )
             if not images_url:
-                return ApiHandler.handle_text_generation_error(
+                return _training_error(
                     "hunyuan-video-lora-training", "Failed to upload images"
                 )
 
@@ -186,14 +646,16 @@ class HunyuanVideoLoraTrainerNode:
                 arguments["data_archive_format"] = data_archive_format
 
             # Submit training job
-            result = ApiHandler.submit_and_get_result(
-                "fal-ai/hunyuan-video-lora-training", arguments
+            return run_training_job(
+                "hunyuan-video-lora-training",
+                "fal-ai/hunyuan-video-lora-training",
+                arguments,
+                "diffusers_lora_file",
+                submit_only,
             )
-            lora_url = result["diffusers_lora_file"]["url"]
-            return (lora_url,)
 
         except Exception as e:
-            return ApiHandler.handle_text_generation_error(
+            return _training_error(
                 "hunyuan-video-lora-training", str(e)
             )
 
@@ -216,11 +678,18 @@ class WanLoraTrainerNode:
             "optional": {
                 "trigger_phrase": ("STRING", {"default": ""}),
                 "auto_scale_input": ("BOOLEAN", {"default": True}),
+                "images": ("IMAGE",),
+                "video_frames": ("IMAGE",),
+                "frames_per_clip": ("INT", {"default": 0, "min": 0, "max": 1000}),
+                "captions": ("STRING", {"default": "", "multiline": True}),
+                "reuse_uploaded_dataset": ("BOOLEAN", {"default": True}),
+                "clip_fps": ("FLOAT", {"default": 16.0, "min": 1.0, "max": 60.0}),
+                "submit_only": ("BOOLEAN", {"default": False}),
             },
         }
 
-    RETURN_TYPES = ("STRING",)
-    RETURN_NAMES = ("lora_file_url",)
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("lora_file_url", "job_handle")
     FUNCTION = "train_lora"
     CATEGORY = "FAL/Training"
 
@@ -231,11 +700,28 @@ class WanLoraTrainerNode:
         learning_rate,
         trigger_phrase="",
         auto_scale_input=True,
+        images=None,
+        video_frames=None,
+        frames_per_clip=0,
+        captions="",
+        reuse_uploaded_dataset=True,
+        clip_fps=16.0,
+        submit_only=False,
     ):
         try:
+            if not training_data_url and (images is not None or video_frames is not None):
+                training_data_url = upload_media_dataset(
+                    "wan-trainer",
+                    images,
+                    video_frames,
+                    frames_per_clip,
+                    captions,
+                    clip_fps,
+                    reuse_uploaded_dataset,
+                )
             if not training_data_url:
-                return ApiHandler.handle_text_generation_error(
-                    "wan-trainer", "No training data URL provided"
+                return _training_error(
+                    "wan-trainer", "No training data URL or media provided"
                 )
 
             # Prepare arguments for the API
@@ -250,12 +736,12 @@ class WanLoraTrainerNode:
                 arguments["trigger_phrase"] = trigger_phrase
 
             # Submit training job
-            result = ApiHandler.submit_and_get_result("fal-ai/wan-trainer", arguments)
-            lora_url = result["lora_file"]["url"]
-            return (lora_url,)
+            return run_training_job(
+                "wan-trainer", "fal-ai/wan-trainer", arguments, "lora_file", submit_only
+            )
 
         except Exception as e:
-            return ApiHandler.handle_text_generation_error("wan-trainer", str(e))
+            return _training_error("wan-trainer", str(e))
 
 
 class LtxVideoTrainerNode:
@@ -303,11 +789,17 @@ class LtxVideoTrainerNode:
                     {"default": "1:1"},
                 ),
                 "validation_reverse": ("BOOLEAN", {"default": False}),
+                "images": ("IMAGE",),
+                "video_frames": ("IMAGE",),
+                "frames_per_clip": ("INT", {"default": 0, "min": 0, "max": 1000}),
+                "captions": ("STRING", {"default": "", "multiline": True}),
+                "reuse_uploaded_dataset": ("BOOLEAN", {"default": True}),
+                "submit_only": ("BOOLEAN", {"default": False}),
             },
         }
 
-    RETURN_TYPES = ("STRING",)
-    RETURN_NAMES = ("lora_file_url",)
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("lora_file_url", "job_handle")
     FUNCTION = "train_lora"
     CATEGORY = "FAL/Training"
 
@@ -330,11 +822,27 @@ class LtxVideoTrainerNode:
         validation_resolution="high",
         validation_aspect_ratio="1:1",
         validation_reverse=False,
+        images=None,
+        video_frames=None,
+        frames_per_clip=0,
+        captions="",
+        reuse_uploaded_dataset=True,
+        submit_only=False,
     ):
         try:
+            if not training_data_url and (images is not None or video_frames is not None):
+                training_data_url = upload_media_dataset(
+                    "ltx-video-trainer",
+                    images,
+                    video_frames,
+                    frames_per_clip,
+                    captions,
+                    frame_rate,
+                    reuse_uploaded_dataset,
+                )
             if not training_data_url:
-                return ApiHandler.handle_text_generation_error(
-                    "ltx-video-trainer", "No training data URL provided"
+                return _training_error(
+                    "ltx-video-trainer", "No training data URL or media provided"
                 )
 
             # Prepare arguments for the API
@@ -361,14 +869,309 @@ class LtxVideoTrainerNode:
                 arguments["trigger_phrase"] = trigger_phrase
 
             # Submit training job
-            result = ApiHandler.submit_and_get_result(
-                "fal-ai/ltx-video-trainer", arguments
+            return run_training_job(
+                "ltx-video-trainer",
+                "fal-ai/ltx-video-trainer",
+                arguments,
+                "lora_file",
+                submit_only,
             )
-            lora_url = result["lora_file"]["url"]
-            return (lora_url,)
 
         except Exception as e:
-            return ApiHandler.handle_text_generation_error("ltx-video-trainer", str(e))
+            return _training_error("ltx-video-trainer", str(e))
+
+
+class TrainingJobAwaitNode:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "job_handle": ("STRING", {"default": "", "multiline": False}),
+            },
+            "optional": {
+                "wait": ("BOOLEAN", {"default": True}),
+                "poll_interval": (
+                    "FLOAT",
+                    {"default": 5.0, "min": 0.5, "max": 300.0, "step": 0.5},
+                ),
+                "timeout_seconds": (
+                    "INT",
+                    {"default": 0, "min": 0, "max": 604800, "step": 60},
+                ),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("lora_file_url", "status")
+    FUNCTION = "await_job"
+    CATEGORY = "FAL/Training"
+
+    @classmethod
+    def IS_CHANGED(cls, job_handle, **kwargs):
+        # Finished jobs are stable; anything else has to be polled again on every run
+        try:
+            handle = parse_job_handle(job_handle)
+        except ValueError:
+            return float("nan")
+        entry = _TRAINING_JOBS.get(handle["request_id"]) or {}
+        if entry.get("status") == "COMPLETED" and entry.get("lora_file_url"):
+            return entry["lora_file_url"]
+        return float("nan")
+
+    def await_job(self, job_handle, wait=True, poll_interval=5.0, timeout_seconds=0):
+        try:
+            handle = parse_job_handle(job_handle)
+        except ValueError as e:
+            return (ApiHandler.handle_text_generation_error("training-job", str(e))[0], "FAILED")
+
+        request_id = handle["request_id"]
+        model_name = handle.get("model_name") or handle["endpoint"]
+        entry = _TRAINING_JOBS.get(request_id) or {}
+        if entry.get("status") == "COMPLETED" and entry.get("lora_file_url"):
+            return (entry["lora_file_url"], "COMPLETED")
+
+        try:
+            result = ApiHandler.get_job_result(
+                handle["endpoint"],
+                request_id,
+                wait=wait,
+                timeout=timeout_seconds or None,
+                poll_interval=poll_interval,
+            )
+        except FalJobTimeoutError:
+            _TRAINING_JOBS.update(request_id, status="IN_PROGRESS", **handle)
+            return ("", "TIMEOUT")
+        except Exception as e:
+            _TRAINING_JOBS.update(request_id, status="FAILED", **handle)
+            return (ApiHandler.handle_text_generation_error(model_name, e)[0], "FAILED")
+
+        if result is None:
+            _TRAINING_JOBS.update(request_id, status="IN_PROGRESS", **handle)
+            return ("", "IN_PROGRESS")
+
+        try:
+            lora_url = result[handle.get("result_key") or "diffusers_lora_file"]["url"]
+        except (KeyError, TypeError) as e:
+            _TRAINING_JOBS.update(request_id, status="FAILED", **handle)
+            return (
+                ApiHandler.handle_text_generation_error(
+                    model_name, f"Unexpected training result: {str(e)}"
+                )[0],
+                "FAILED",
+            )
+
+        _TRAINING_JOBS.update(
+            request_id, status="COMPLETED", lora_file_url=lora_url, **handle
+        )
+        return (lora_url, "COMPLETED")
+
+
+# Sweepable trainers: where the dataset URL goes and which API field each swept value maps to.
+# Media trainers take the captioned image/video archive their own nodes build; "fps_key" names
+# the argument that sets the clip frame rate, if the trainer has one.
+_SWEEP_TRAINERS = {
+    "flux-lora-fast-training": {
+        "endpoint": "fal-ai/flux-lora-fast-training",
+        "result_key": "diffusers_lora_file",
+        "data_key": "images_data_url",
+        "trigger_key": "trigger_word",
+        "params": {"steps": "steps"},
+    },
+    "hunyuan-video-lora-training": {
+        "endpoint": "fal-ai/hunyuan-video-lora-training",
+        "result_key": "diffusers_lora_file",
+        "data_key": "images_data_url",
+        "trigger_key": "trigger_word",
+        "params": {"steps": "steps", "learning_rate": "learning_rate"},
+    },
+    "wan-trainer": {
+        "endpoint": "fal-ai/wan-trainer",
+        "result_key": "lora_file",
+        "data_key": "training_data_url",
+        "trigger_key": "trigger_phrase",
+        "params": {"steps": "number_of_steps", "learning_rate": "learning_rate"},
+        "media_dataset": True,
+    },
+    "ltx-video-trainer": {
+        "endpoint": "fal-ai/ltx-video-trainer",
+        "result_key": "lora_file",
+        "data_key": "training_data_url",
+        "trigger_key": "trigger_phrase",
+        "params": {
+            "steps": "number_of_steps",
+            "learning_rate": "learning_rate",
+            "rank": "rank",
+        },
+        "media_dataset": True,
+        "fps_key": "frame_rate",
+    },
+}
+
+
+def _parse_sweep_values(text, cast):
+    """Parse a comma/whitespace separated list of values, keeping order and dropping repeats."""
+    values = []
+    for token in (text or "").replace(",", " ").split():
+        value = cast(token)
+        if value not in values:
+            values.append(value)
+    return values
+
+
+def _run_sweep_job(trainer, endpoint, arguments, result_key, sweep_start):
+    started = time.monotonic()
+    record = {"started_after_seconds": round(started - sweep_start, 2)}
+    try:
+        # Recorded in the job store, so a dropped sweep can still be collected with the await node
+        handle = submit_training_job(trainer, endpoint, arguments, result_key)
+        record["request_id"] = handle["request_id"]
+        record.update(status="COMPLETED", lora_file_url=await_training_job(handle))
+    except Exception as e:
+        message = e.message if isinstance(e, FalAPIError) else str(e)
+        print(f"Error in {endpoint} sweep job: {message}")
+        record.update(status="FAILED", lora_file_url="", error=message)
+    record["seconds"] = round(time.monotonic() - started, 2)
+    return record
+
+
+class LoraTrainingSweepNode:
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "trainer": (list(_SWEEP_TRAINERS.keys()),),
+                "steps_values": ("STRING", {"default": "500, 1000"}),
+                "learning_rate_values": ("STRING", {"default": ""}),
+                "rank_values": ("STRING", {"default": ""}),
+                "max_parallel": ("INT", {"default": 4, "min": 1, "max": 32}),
+            },
+            "optional": {
+                "images": ("IMAGE",),
+                "training_data_url": ("STRING", {"default": ""}),
+                "trigger_word": ("STRING", {"default": ""}),
+                "extra_arguments": ("STRING", {"default": "{}", "multiline": True}),
+                "reuse_uploaded_dataset": ("BOOLEAN", {"default": True}),
+                "preprocess": (PREPROCESS_MODES, {"default": "none"}),
+                "preprocess_resolution": (
+                    "INT",
+                    {"default": 1024, "min": 256, "max": 4096, "step": 64},
+                ),
+                "video_frames": ("IMAGE",),
+                "frames_per_clip": ("INT", {"default": 0, "min": 0, "max": 1000}),
+                "captions": ("STRING", {"default": "", "multiline": True}),
+                "clip_fps": ("FLOAT", {"default": 16.0, "min": 1.0, "max": 60.0}),
+            },
+        }
+
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("lora_file_urls", "sweep_report")
+    FUNCTION = "run_sweep"
+    CATEGORY = "FAL/Training"
+
+    def run_sweep(
+        self,
+        trainer,
+        steps_values,
+        learning_rate_values,
+        rank_values,
+        max_parallel,
+        images=None,
+        training_data_url="",
+        trigger_word="",
+        extra_arguments="{}",
+        reuse_uploaded_dataset=True,
+        preprocess="none",
+        preprocess_resolution=1024,
+        video_frames=None,
+        frames_per_clip=0,
+        captions="",
+        clip_fps=16.0,
+    ):
+        spec = _SWEEP_TRAINERS[trainer]
+        try:
+            swept = {
+                "steps": _parse_sweep_values(steps_values, int),
+                "learning_rate": _parse_sweep_values(learning_rate_values, float),
+                "rank": _parse_sweep_values(rank_values, int),
+            }
+            base_arguments = json.loads(extra_arguments or "{}")
+            if not isinstance(base_arguments, dict):
+                raise ValueError("extra_arguments must be a JSON object")
+        except ValueError as e:
+            return _training_error(trainer, f"Invalid sweep values: {str(e)}")
+
+        axes = []
+        for name, values in swept.items():
+            if not values:
+                continue
+            if name not in spec["params"]:
+                print(f"Warning: {trainer} does not support sweeping {name}; ignoring it")
+                continue
+            axes.append((spec["params"][name], values))
+        if not axes:
+            return _training_error(trainer, "No sweep values provided")
+
+        # The dataset is uploaded once and shared by every job in the sweep
+        data_url = training_data_url
+        if not data_url and spec.get("media_dataset"):
+            # Same captioned image/video archive as the trainer's own node builds
+            if images is None and video_frames is None:
+                return _training_error(trainer, "Provide media or a training data URL")
+            fps = base_arguments.get(spec.get("fps_key"), clip_fps)
+            data_url = upload_media_dataset(
+                trainer,
+                images,
+                video_frames,
+                frames_per_clip,
+                captions,
+                fps,
+                reuse_uploaded_dataset,
+            )
+            if not data_url:
+                return _training_error(trainer, "Failed to upload media")
+        elif not data_url:
+            if images is None:
+                return _training_error(trainer, "Provide images or a training data URL")
+            data_url = upload_image_dataset(
+                images, reuse_uploaded_dataset, preprocess, preprocess_resolution
+            )
+            if not data_url:
+                return _training_error(trainer, "Failed to upload images")
+
+        base_arguments[spec["data_key"]] = data_url
+        if trigger_word:
+            base_arguments[spec["trigger_key"]] = trigger_word
+
+        combinations = [{}]
+        for key, values in axes:
+            combinations = [{**combo, key: value} for combo in combinations for value in values]
+
+        sweep_start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=min(max_parallel, len(combinations))) as executor:
+            futures = [
+                executor.submit(
+                    _run_sweep_job,
+                    trainer,
+                    spec["endpoint"],
+                    {**base_arguments, **combo},
+                    spec["result_key"],
+                    sweep_start,
+                )
+                for combo in combinations
+            ]
+            records = [
+                {"parameters": combo, **future.result()}
+                for combo, future in zip(combinations, futures)
+            ]
+
+        report = {
+            "trainer": trainer,
+            "training_data_url": data_url,
+            "total_seconds": round(time.monotonic() - sweep_start, 2),
+            "jobs": records,
+        }
+        lora_urls = "\n".join(record["lora_file_url"] for record in records)
+        return (lora_urls, json.dumps(report, indent=2))
 
 
 # Node class mappings
@@ -377,6 +1180,8 @@ NODE_CLASS_MAPPINGS = {
     "HunyuanVideoLoraTrainer_fal": HunyuanVideoLoraTrainerNode,
     "WanLoraTrainer_fal": WanLoraTrainerNode,
     "LtxVideoTrainer_fal": LtxVideoTrainerNode,
+    "TrainingJobAwait_fal": TrainingJobAwaitNode,
+    "LoraTrainingSweep_fal": LoraTrainingSweepNode,
 }
 
 # Node display name mappings
@@ -385,4 +1190,6 @@ NODE_DISPLAY_NAME_MAPPINGS = {
     "HunyuanVideoLoraTrainer_fal": "Hunyuan Video LoRA Trainer (fal)",
     "WanLoraTrainer_fal": "WAN LoRA Trainer (fal)",
     "LtxVideoTrainer_fal": "LTX Video LoRA Trainer (fal)",
+    "TrainingJobAwait_fal": "Await Training Job (fal)",
+    "LoraTrainingSweep_fal": "LoRA Training Sweep (fal)",
 }
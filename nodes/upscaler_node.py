@@ -1,9 +1,123 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+import torch.nn.functional as F
+
 from .fal_utils import ApiHandler, FalConfig, ImageUtils, ResultProcessor
 
 # Initialize FalConfig
 fal_config = FalConfig()
 
 
+def _tile_starts(length, tile, overlap):
+    """Evenly spaced tile offsets covering ``length`` with at least ``overlap`` shared pixels."""
+    if length <= tile:
+        return [0]
+    count = math.ceil((length - overlap) / (tile - overlap))
+    return [round(i * (length - tile) / (count - 1)) for i in range(count)]
+
+
+def _feather_ramp(size, ramp, fade_start, fade_end):
+    """1D blend weights: linear ramps on the edges shared with a neighbour tile, 1 elsewhere."""
+    positions = torch.arange(size, dtype=torch.float32) + 0.5
+    weights = torch.ones(size)
+    if fade_start and ramp > 0:
+        weights = torch.minimum(weights, positions / ramp)
+    if fade_end and ramp > 0:
+        weights = torch.minimum(weights, (size - positions) / ramp)
+    return weights
+
+
+def _fit_to(image, height, width):
+    """Resize an (H, W, C) result when the endpoint rounded its size differently from ours."""
+    if tuple(image.shape[:2]) == (height, width):
+        return image
+    return F.interpolate(
+        image.movedim(-1, 0).unsqueeze(0),
+        size=(height, width),
+        mode="bicubic",
+        align_corners=False,
+    )[0].movedim(0, -1)
+
+
+def upscale_tiled(image, arguments, tile_size, tile_overlap, max_parallel):
+    """Upscale overlapping tiles as concurrent jobs and feather-blend them into one image."""
+    frame = image[0] if image.ndim == 4 else image
+    height, width = int(frame.shape[0]), int(frame.shape[1])
+    factor = float(arguments["upscale_factor"])
+    overlap = min(tile_overlap, tile_size // 2)
+    boxes = [
+        (top, left, min(tile_size, height), min(tile_size, width))
+        for top in _tile_starts(height, tile_size, overlap)
+        for left in _tile_starts(width, tile_size, overlap)
+    ]
+
+    def upscale_tile(box):
+        top, left, tile_h, tile_w = box
+        tile_url = ImageUtils.upload_image(frame[top : top + tile_h, left : left + tile_w])
+        if not tile_url:
+            raise RuntimeError("Failed to upload tile for upscaling")
+        result = ApiHandler.submit_and_get_result(
+            "fal-ai/clarity-upscaler", {**arguments, "image_url": tile_url}
+        )
+        return ResultProcessor.images_from_result(result)[0]
+
+    out_h, out_w = round(height * factor), round(width * factor)
+    canvas = torch.zeros(out_h, out_w, 3)
+    weights = torch.zeros(out_h, out_w, 1)
+    ramp = overlap * factor
+    with ThreadPoolExecutor(max_workers=min(max_parallel, len(boxes))) as executor:
+        for (top, left, tile_h, tile_w), tile in zip(boxes, executor.map(upscale_tile, boxes)):
+            y0, x0 = round(top * factor), round(left * factor)
+            y1 = min(out_h, round((top + tile_h) * factor))
+            x1 = min(out_w, round((left + tile_w) * factor))
+            tile = _fit_to(tile, y1 - y0, x1 - x0)
+            mask = torch.outer(
+                _feather_ramp(y1 - y0, ramp, top > 0, top + tile_h < height),
+                _feather_ramp(x1 - x0, ramp, left > 0, left + tile_w < width),
+            ).unsqueeze(-1)
+            canvas[y0:y1, x0:x1] += tile * mask
+            weights[y0:y1, x0:x1] += mask
+
+    return (canvas / weights.clamp_min(1e-6)).clamp(0.0, 1.0).unsqueeze(0)
+
+
+def upscale_batch(images, arguments, max_parallel, tiled, tile_size, tile_overlap):
+    """Upscale every image of a batch concurrently into one preallocated output batch.
+
+    An image that fails is logged and left black so the rest of the batch survives.
+    """
+    count, height, width = (int(dim) for dim in images.shape[:3])
+    factor = float(arguments["upscale_factor"])
+    out_h, out_w = round(height * factor), round(width * factor)
+    output = torch.zeros(count, out_h, out_w, 3)
+
+    def upscale_one(index):
+        try:
+            if tiled:
+                # Tiles already fan out, so images are taken one at a time
+                result = upscale_tiled(
+                    images[index], arguments, tile_size, tile_overlap, max_parallel
+                )[0]
+            else:
+                image_url = ImageUtils.upload_image(images[index])
+                if not image_url:
+                    raise RuntimeError("Failed to upload image for upscaling")
+                response = ApiHandler.submit_and_get_result(
+                    "fal-ai/clarity-upscaler", {**arguments, "image_url": image_url}
+                )
+                result = ResultProcessor.images_from_result(response)[0]
+            output[index] = _fit_to(result, out_h, out_w)
+        except Exception as e:
+            print(f"Error upscaling image {index} with clarity-upscaler: {str(e)}")
+
+    workers = 1 if tiled else min(max_parallel, count)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(upscale_one, range(count)))
+    return output
+
+
 class UpscalerNode:
     @classmethod
     def INPUT_TYPES(cls):
@@ -38,6 +152,16 @@ class UpscalerNode:
             },
             "optional": {
                 "seed": ("INT", {"default": -1}),
+                "tiled": ("BOOLEAN", {"default": False}),
+                "tile_size": (
+                    "INT",
+                    {"default": 1024, "min": 256, "max": 2048, "step": 64},
+                ),
+                "tile_overlap": (
+                    "INT",
+                    {"default": 128, "min": 0, "max": 512, "step": 16},
+                ),
+                "max_parallel": ("INT", {"default": 4, "min": 1, "max": 32}),
             },
         }
 
@@ -56,17 +180,13 @@ class UpscalerNode:
         num_inference_steps,
         enable_safety_checker,
         seed=-1,
+        tiled=False,
+        tile_size=1024,
+        tile_overlap=128,
+        max_parallel=4,
     ):
         try:
-            # Upload the image using ImageUtils
-            image_url = ImageUtils.upload_image(image)
-            if not image_url:
-                return ApiHandler.handle_image_generation_error(
-                    "clarity-upscaler", "Failed to upload image for upscaling"
-                )
-
             arguments = {
-                "image_url": image_url,
                 "prompt": "masterpiece, best quality, highres",
                 "upscale_factor": upscale_factor,
                 "negative_prompt": negative_prompt,
@@ -80,6 +200,26 @@ class UpscalerNode:
             if seed != -1:
                 arguments["seed"] = seed
 
+            if image.ndim == 4 and image.shape[0] > 1:
+                return (
+                    upscale_batch(
+                        image, arguments, max_parallel, tiled, tile_size, tile_overlap
+                    ),
+                )
+
+            if tiled:
+                return (
+                    upscale_tiled(image, arguments, tile_size, tile_overlap, max_parallel),
+                )
+
+            # Upload the image using ImageUtils
+            image_url = ImageUtils.upload_image(image)
+            if not image_url:
+                return ApiHandler.handle_image_generation_error(
+                    "clarity-upscaler", "Failed to upload image for upscaling"
+                )
+            arguments["image_url"] = image_url
+
             result = ApiHandler.submit_and_get_result(
                 "fal-ai/clarity-upscaler", arguments
             )
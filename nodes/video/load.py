@@ -1,12 +1,324 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import math
+import multiprocessing
 import os
 import tempfile
+import time
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import cv2
+import numpy as np
 import requests
 import torch
 
+from ..fal_utils import LRUDirectoryCache, Uint8FrameTensor, VideoUtils
+
+# Decoded frames are cached on disk so repeated queue runs skip download and decode
+_FRAME_CACHE_DIR = os.getenv(
+    "FAL_VIDEO_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "comfyui-fal-video-cache"),
+)
+_FRAME_CACHE_MAX_BYTES = int(float(os.getenv("FAL_VIDEO_CACHE_MAX_GB", "8")) * 1024**3)
+_FRAME_CACHE_VERSION = 3
+_HEAD_TIMEOUT_SECONDS = 10.0
+# Segments shorter than this cost more in process startup and seeking than they save
+_MIN_SEGMENT_FRAMES = 64
+# A parallel decode that has not finished by then is abandoned for the single decoder
+_PARALLEL_DECODE_TIMEOUT_SECONDS = float(os.getenv("FAL_VIDEO_DECODE_TIMEOUT_SECONDS", "600"))
+
+
+class DecodedFrameCache(LRUDirectoryCache):
+    """Size-bounded LRU of decoded uint8 frame arrays stored as memory-mapped ``.npy`` files."""
+
+    # The array is written before its metadata, so a readable .json implies a complete .npy
+    SUFFIXES = (".npy", ".json")
+
+    @staticmethod
+    def make_key(url: str, etag: Optional[str], params: Dict[str, Any]) -> str:
+        payload = json.dumps(
+            {
+                "version": _FRAME_CACHE_VERSION,
+                "url": url,
+                "etag": etag,
+                "params": params,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[torch.Tensor, Dict[str, Any]]]:
+        """Return the cached frames as a uint8 tensor backed by the mmap, plus its video_info."""
+
+        array_path, meta_path = self.paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as handle:
+                video_info = json.load(handle)
+            # Copy-on-write keeps the mapping writable for torch without touching the file
+            frames = np.load(array_path, mmap_mode="c")
+        except (OSError, ValueError):
+            return None
+
+        self.touch(key)
+        return torch.from_numpy(frames), video_info
+
+    def put(self, key: str, frames: np.ndarray, video_info: Dict[str, Any]) -> None:
+        if frames.nbytes > self.max_bytes:
+            return
+
+        self.store(
+            key,
+            lambda handle: np.save(handle, frames),
+            lambda handle: handle.write(json.dumps(video_info).encode("utf-8")),
+        )
+
+
+_FRAME_CACHE = DecodedFrameCache(_FRAME_CACHE_DIR, _FRAME_CACHE_MAX_BYTES)
+
+
+def _fetch_etag(url: str) -> Optional[str]:
+    """Return a cheap validator for the remote file without downloading it.
+
+    Presigned and CDN URLs often reject HEAD, so a one-byte ranged GET is tried next.
+    ``None`` means the content cannot be validated and must not be served from cache.
+    """
+
+    probes = (
+        lambda: requests.head(url, allow_redirects=True, timeout=_HEAD_TIMEOUT_SECONDS),
+        lambda: requests.get(
+            url,
+            headers={"Range": "bytes=0-0"},
+            stream=True,
+            allow_redirects=True,
+            timeout=_HEAD_TIMEOUT_SECONDS,
+        ),
+    )
+    for probe in probes:
+        try:
+            with probe() as response:
+                response.raise_for_status()
+                headers = response.headers
+                validator = headers.get("ETag") or headers.get("Last-Modified")
+        except requests.RequestException:
+            continue
+        if validator:
+            return validator
+    return None
+
+
+def _iter_frame_plan(
+    total_frames: int,
+    fps: float,
+    force_rate: int,
+    skip_first_frames: int,
+    select_every_nth: int,
+    frame_load_cap: int,
+) -> Iterator[Tuple[int, List[int]]]:
+    """Yield ``(source_index, output_positions)`` for every source frame that must be decoded.
+
+    ``force_rate`` resamples the source timeline by timestamp first: output slot ``k``
+    shows the source frame on screen at ``k / force_rate``. ``skip_first_frames``,
+    ``select_every_nth`` and ``frame_load_cap`` then apply to the resampled stream.
+    """
+
+    ratio = force_rate / fps if force_rate and fps > 0 else 1.0
+    last_slot = (
+        skip_first_frames + (frame_load_cap - 1) * select_every_nth
+        if frame_load_cap > 0
+        else None
+    )
+
+    index = 0
+    while total_frames <= 0 or index < total_frames:
+        # Source frame i is displayed during [i / fps, (i + 1) / fps)
+        first_slot = math.ceil(index * ratio - 1e-9)
+        end_slot = math.ceil((index + 1) * ratio - 1e-9)
+        if last_slot is not None and first_slot > last_slot:
+            return
+        if last_slot is not None:
+            end_slot = min(end_slot, last_slot + 1)
+
+        positions = [
+            (slot - skip_first_frames) // select_every_nth
+            for slot in range(max(first_slot, skip_first_frames), end_slot)
+            if (slot - skip_first_frames) % select_every_nth == 0
+        ]
+        if positions:
+            yield index, positions
+        index += 1
+
+
+def _skip_frames(cap, count: int) -> bool:
+    for _ in range(count):
+        if not cap.grab():
+            return False
+    return True
+
+
+def _iter_decoded(
+    cap,
+    plan: Iterable[Tuple[int, List[int]]],
+    size: Optional[Tuple[int, int]],
+    position: int = 0,
+) -> Iterator[Tuple[List[int], np.ndarray]]:
+    """Decode the planned frames from ``cap`` as RGB uint8, starting at source frame ``position``."""
+
+    for index, positions in plan:
+        # grab() advances without the BGR conversion and copy that retrieve() pays for
+        if not _skip_frames(cap, index - position) or not cap.grab():
+            return
+        position = index + 1
+
+        ret, frame = cap.retrieve()
+        if not ret:
+            return
+
+        if size is not None:
+            frame = cv2.resize(frame, size)
+
+        yield positions, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+
+def _split_plan(
+    plan: List[Tuple[int, List[int]]], workers: int
+) -> List[List[Tuple[int, List[int]]]]:
+    """Cut the plan into contiguous segments spanning roughly equal source frame ranges."""
+
+    if not plan:
+        return []
+    first, last = plan[0][0], plan[-1][0]
+    span = last - first + 1
+    workers = max(1, min(workers, span // _MIN_SEGMENT_FRAMES))
+    segment_span = math.ceil(span / workers)
+
+    segments: List[List[Tuple[int, List[int]]]] = []
+    for entry in plan:
+        segment_index = (entry[0] - first) // segment_span
+        while len(segments) <= segment_index:
+            segments.append([])
+        segments[segment_index].append(entry)
+    return [segment for segment in segments if segment]
+
+
+def _decode_segment(
+    path: str,
+    shm_name: str,
+    shape: Tuple[int, ...],
+    segment: List[Tuple[int, List[int]]],
+    size: Optional[Tuple[int, int]],
+) -> int:
+    """Process-pool worker: decode one plan segment into its own shared memory block.
+
+    The block holds the segment's output frames only, starting at its first position.
+    Returns how many plan entries were written so the parent can detect early EOF.
+    """
+
+    cv2.setNumThreads(1)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    cap = cv2.VideoCapture(path)
+    try:
+        position = 0
+        start = segment[0][0]
+        if start > 0:
+            # The FFmpeg backend seeks to the preceding keyframe and decodes forward from there
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+            position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+            if position != start:
+                cap.release()
+                cap = cv2.VideoCapture(path)
+                position = 0
+
+        out = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        offset = segment[0][1][0]
+        written = 0
+        try:
+            for positions, frame in _iter_decoded(cap, segment, size, position):
+                out[positions[0] - offset : positions[-1] + 1 - offset] = frame
+                written += 1
+        finally:
+            del out
+        return written
+    finally:
+        cap.release()
+        shm.close()
+
+
+def _pool_context():
+    # Forked workers inherit this module; spawned ones could not re-import a custom node package
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def _decode_parallel(
+    path: str,
+    segments: List[List[Tuple[int, List[int]]]],
+    frame_size: Tuple[int, int],
+    size: Optional[Tuple[int, int]],
+) -> Optional[np.ndarray]:
+    """Decode segments in a process pool; returns ``None`` so the caller can fall back on failure.
+
+    Each segment decodes into its own shared memory block, which is copied into the output
+    and released as soon as the segment is done, so peak memory stays near one output copy.
+    Forked workers can deadlock on locks held by the parent's other threads, so the pool is
+    killed after ``_PARALLEL_DECODE_TIMEOUT_SECONDS``.
+    """
+
+    frame_shape = (frame_size[0], frame_size[1], 3)
+    shapes = [(segment[-1][1][-1] - segment[0][1][0] + 1,) + frame_shape for segment in segments]
+    count = segments[-1][-1][1][-1] + 1
+    frames = np.empty((count,) + frame_shape, dtype=np.uint8)
+    blocks: List[shared_memory.SharedMemory] = []
+
+    def release(block: shared_memory.SharedMemory) -> None:
+        block.close()
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+
+    try:
+        for shape in shapes:
+            blocks.append(
+                shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape))))
+            )
+        deadline = time.monotonic() + _PARALLEL_DECODE_TIMEOUT_SECONDS
+        # Leaving the block terminates the workers, including ones stuck after a timeout
+        with _pool_context().Pool(len(segments)) as pool:
+            results = [
+                pool.apply_async(_decode_segment, (path, block.name, shape, segment, size))
+                for block, shape, segment in zip(blocks, shapes, segments)
+            ]
+            for block, shape, segment, result in zip(blocks, shapes, segments, results):
+                entries = result.get(timeout=max(0.0, deadline - time.monotonic()))
+                offset = segment[0][1][0]
+                decoded = np.ndarray(shape, dtype=np.uint8, buffer=block.buf)
+                try:
+                    frames[offset : offset + shape[0]] = decoded
+                finally:
+                    del decoded
+                release(block)
+                # A segment that hit EOF early truncates the output at its first missing frame
+                if entries < len(segment):
+                    return frames[: segment[entries][1][0]]
+        return frames
+    except multiprocessing.TimeoutError:
+        print(
+            "Warning: parallel video decode timed out after "
+            f"{_PARALLEL_DECODE_TIMEOUT_SECONDS:.0f}s, using a single decoder"
+        )
+        return None
+    except Exception as exc:
+        print(f"Warning: parallel video decode failed, using a single decoder: {exc}")
+        return None
+    finally:
+        for block in blocks:
+            if block.buf is not None:
+                release(block)
+
 
 class LoadVideoURL:
     @classmethod
@@ -50,6 +362,17 @@ class LoadVideoURL:
                     {"default": 1, "min": 1, "max": 1_000_000, "step": 1},
                 ),
             },
+            "optional": {
+                "use_cache": ("BOOLEAN", {"default": True}),
+                "decode_workers": (
+                    "INT",
+                    {"default": 1, "min": 0, "max": 128, "step": 1},
+                ),
+                "output_precision": (
+                    ["float32", "float16", "uint8"],
+                    {"default": "float32"},
+                ),
+            },
         }
 
     RETURN_TYPES = ("IMAGE", "INT", "VHS_VIDEOINFO")
@@ -67,7 +390,86 @@ class LoadVideoURL:
         frame_load_cap,
         skip_first_frames,
         select_every_nth,
+        use_cache=True,
+        decode_workers=1,
+        output_precision="float32",
     ):
+        cache_key = None
+        if use_cache:
+            params = {
+                "force_rate": force_rate,
+                "force_size": force_size,
+                "custom_width": custom_width,
+                "custom_height": custom_height,
+                "frame_load_cap": frame_load_cap,
+                "skip_first_frames": skip_first_frames,
+                "select_every_nth": select_every_nth,
+            }
+            etag = _fetch_etag(url)
+            if etag is None:
+                # Without a validator a changed file behind the same URL would go unnoticed
+                print("Warning: video URL has no ETag or Last-Modified; skipping the frame cache")
+            else:
+                cache_key = DecodedFrameCache.make_key(url, etag, params)
+                cached = _FRAME_CACHE.get(cache_key)
+                if cached is not None:
+                    frames, video_info = cached
+                    return self._to_output(frames, video_info, output_precision)
+
+        frames_array, video_info = self._download_and_decode(
+            url,
+            force_rate,
+            force_size,
+            custom_width,
+            custom_height,
+            frame_load_cap,
+            skip_first_frames,
+            select_every_nth,
+            decode_workers,
+        )
+        # Lets upload_video hand the original URL back instead of re-encoding unchanged frames
+        video_info["source_url"] = url
+        video_info["frame_fingerprint"] = VideoUtils.frame_fingerprint(frames_array)
+
+        if cache_key is not None and frames_array.size:
+            try:
+                _FRAME_CACHE.put(cache_key, frames_array, video_info)
+            except OSError as exc:
+                print(f"Warning: failed to cache decoded video frames: {exc}")
+
+        return self._to_output(
+            torch.from_numpy(frames_array), video_info, output_precision
+        )
+
+    @staticmethod
+    def _to_output(
+        frames: torch.Tensor, video_info: Dict[str, Any], output_precision: str
+    ):
+        frame_count = int(frames.shape[0]) if frames.ndim == 4 else 0
+        if not frame_count:
+            return (torch.empty(0), 0, video_info)
+
+        if output_precision == "uint8":
+            # Stays on the uint8 (possibly memory-mapped) storage until a consumer needs floats
+            frames_tensor = Uint8FrameTensor(frames)
+        elif output_precision == "float16":
+            frames_tensor = frames.half().div_(255.0)
+        else:
+            frames_tensor = frames.float().div_(255.0)
+        return (frames_tensor, frame_count, video_info)
+
+    def _download_and_decode(
+        self,
+        url,
+        force_rate,
+        force_size,
+        custom_width,
+        custom_height,
+        frame_load_cap,
+        skip_first_frames,
+        select_every_nth,
+        decode_workers=1,
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
         with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as temp_file:
             response = requests.get(url, stream=True)
             response.raise_for_status()
@@ -75,8 +477,39 @@ class LoadVideoURL:
                 temp_file.write(chunk)
             temp_file_path = temp_file.name
 
-        cap = cv2.VideoCapture(temp_file_path)
+        try:
+            cap = cv2.VideoCapture(temp_file_path)
+            try:
+                return self._decode_capture(
+                    cap,
+                    temp_file_path,
+                    force_rate,
+                    force_size,
+                    custom_width,
+                    custom_height,
+                    frame_load_cap,
+                    skip_first_frames,
+                    select_every_nth,
+                    decode_workers,
+                )
+            finally:
+                cap.release()
+        finally:
+            os.unlink(temp_file_path)
 
+    @staticmethod
+    def _decode_capture(
+        cap,
+        path,
+        force_rate,
+        force_size,
+        custom_width,
+        custom_height,
+        frame_load_cap,
+        skip_first_frames,
+        select_every_nth,
+        decode_workers,
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
         fps = cap.get(cv2.CAP_PROP_FPS)
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
@@ -105,36 +538,39 @@ class LoadVideoURL:
         else:
             new_width, new_height = width, height
 
-        frames = []
-        frame_count = 0
-
-        for i in range(total_frames):
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            if i < skip_first_frames:
-                continue
-
-            if (i - skip_first_frames) % select_every_nth != 0:
-                continue
-
-            if force_size != "Disabled":
-                frame = cv2.resize(frame, (new_width, new_height))
+        size = (new_width, new_height) if force_size != "Disabled" else None
+        plan = _iter_frame_plan(
+            total_frames,
+            fps,
+            force_rate,
+            skip_first_frames,
+            select_every_nth,
+            frame_load_cap,
+        )
 
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            frame = torch.from_numpy(frame).float() / 255.0
-            frames.append(frame)
-
-            frame_count += 1
+        frames_array = None
+        workers = decode_workers if decode_workers > 0 else (os.cpu_count() or 1)
+        if workers > 1 and total_frames > 0:
+            plan = list(plan)
+            segments = _split_plan(plan, workers)
+            if len(segments) > 1:
+                frames_array = _decode_parallel(
+                    path, segments, (new_height, new_width), size
+                )
 
-            if frame_load_cap > 0 and frame_count >= frame_load_cap:
-                break
+        if frames_array is None:
+            # Keep frames as uint8 until the very end; the float conversion happens once on output
+            frames = []
+            for positions, frame in _iter_decoded(cap, plan, size):
+                # Upsampling with force_rate repeats the same frame for several output slots
+                frames.extend(frame for _ in positions)
+            frames_array = (
+                np.stack(frames)
+                if frames
+                else np.empty((0, new_height, new_width, 3), np.uint8)
+            )
 
-        cap.release()
-        os.unlink(temp_file_path)
-
-        frames_tensor = torch.stack(frames) if frames else torch.empty(0)
+        frame_count = int(frames_array.shape[0])
 
         loaded_fps = fps if force_rate == 0 else force_rate
         video_info = {
@@ -150,7 +586,7 @@ class LoadVideoURL:
             "loaded_height": new_height,
         }
 
-        return (frames_tensor, frame_count, video_info)
+        return frames_array, video_info
 
 
 NODE_CLASS_MAPPINGS = {
@@ -1,6 +1,19 @@
 from __future__ import annotations
 
-from ..fal_utils import ApiHandler
+from concurrent.futures import ThreadPoolExecutor
+
+from ..fal_utils import ApiHandler, VideoUtils
+
+
+def _upscale_segment(segment, video_info, scale):
+    """Upload one segment (frames or MP4 bytes), upscale it and return the result URL."""
+
+    segment_url = VideoUtils.upload_video(segment, video_info)
+    if not segment_url:
+        raise RuntimeError("Failed to upload video segment")
+    return ApiHandler.generate_video_url(
+        "fal-ai/video-upscaler", {"video_url": segment_url, "scale": scale}
+    )
 
 
 class VideoUpscalerNode:
@@ -14,19 +27,111 @@ class VideoUpscalerNode:
                     {"default": 2.0, "min": 1.0, "max": 4.0, "step": 0.5},
                 ),
             },
+            "optional": {
+                "video": ("IMAGE",),
+                "video_info": ("VHS_VIDEOINFO",),
+                "segment_mode": (["off", "keyframes", "frames"], {"default": "off"}),
+                "segment_frames": ("INT", {"default": 240, "min": 16, "max": 10000}),
+                "max_parallel": ("INT", {"default": 4, "min": 1, "max": 16}),
+            },
         }
 
     RETURN_TYPES = ("STRING",)
     FUNCTION = "upscale_video"
     CATEGORY = "FAL/VideoGeneration"
 
-    def upscale_video(self, video_url, scale):
+    def upscale_video(
+        self,
+        video_url,
+        scale,
+        video=None,
+        video_info=None,
+        segment_mode="off",
+        segment_frames=240,
+        max_parallel=4,
+    ):
+        video_url = (video_url or "").strip()
+        if segment_mode != "off":
+            try:
+                return self._upscale_segmented(
+                    video_url,
+                    scale,
+                    video,
+                    video_info,
+                    segment_mode,
+                    segment_frames,
+                    max_parallel,
+                )
+            except Exception as exc:
+                return ApiHandler.handle_video_generation_error("video-upscaler", exc)
+
+        if not video_url and video is not None:
+            video_url = VideoUtils.upload_video(video, video_info)
+            if not video_url:
+                return ApiHandler.handle_video_generation_error(
+                    "video-upscaler", "Failed to upload video frames"
+                )
+
         arguments = {"video_url": video_url, "scale": scale}
 
         return ApiHandler.run_video_job(
             "video-upscaler", "fal-ai/video-upscaler", arguments
         )
 
+    def _upscale_segmented(
+        self, video_url, scale, video, video_info, segment_mode, segment_frames, max_parallel
+    ):
+        """Upscale the video in segments side by side and stitch the results.
+
+        Segments are video-only; for URL inputs the original audio track is copied back onto
+        the stitched result. Frame inputs carry no audio.
+        """
+        source = None
+        if video_url:
+            # Stream copy can only cut on keyframes, so both modes snap to the next keyframe
+            if segment_mode == "frames":
+                print("Warning: URL inputs are cut at the first keyframe after each boundary")
+            source = VideoUtils.download_video(video_url)
+            segments = VideoUtils.split_mp4_at_keyframes(source, segment_frames)
+        elif video is not None:
+            # Each frame segment is encoded on its own, so it always starts on a keyframe
+            segments = [
+                video[start : start + segment_frames]
+                for start in range(0, video.shape[0], segment_frames)
+            ]
+        else:
+            raise ValueError("Provide a video URL or video frames")
+
+        if not segments:
+            raise ValueError("Video did not contain any frames")
+        if len(segments) == 1 and video_url:
+            arguments = {"video_url": video_url, "scale": scale}
+            return ApiHandler.run_video_job(
+                "video-upscaler", "fal-ai/video-upscaler", arguments
+            )
+
+        with ThreadPoolExecutor(max_workers=min(max_parallel, len(segments))) as executor:
+            upscaled_urls = list(
+                executor.map(
+                    lambda segment: _upscale_segment(segment, video_info, scale), segments
+                )
+            )
+            # A single upscaled segment already is the whole video
+            if len(upscaled_urls) == 1:
+                return (upscaled_urls[0],)
+            upscaled = list(executor.map(VideoUtils.download_video, upscaled_urls))
+
+        joined = VideoUtils.concat_mp4(upscaled)
+        if source is not None:
+            try:
+                joined = VideoUtils.copy_audio(joined, source)
+            except Exception as exc:
+                print(f"Warning: upscaled video has no audio; copying the track failed: {exc}")
+        output_url = VideoUtils.upload_video(joined)
+        if not output_url:
+            raise RuntimeError("Failed to upload the stitched video")
+        return (output_url,)
+
 
 NODE_CLASS_MAPPINGS = {
     "VideoUpscaler_fal": VideoUpscalerNode,
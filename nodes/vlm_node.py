@@ -1,4 +1,73 @@
-from .fal_utils import ApiHandler, ImageUtils
+from concurrent.futures import ThreadPoolExecutor
+
+from .fal_utils import (
+    TEXT_CACHE_MODES,
+    ApiHandler,
+    FalAPIError,
+    ImageUtils,
+    TextResponseCache,
+)
+from .llm_node import build_llm_arguments
+
+# (longest side, shortest side) each provider's vision encoder works at; anything larger
+# is downsampled server-side anyway, so it is resized before encoding and upload
+_VLM_MAX_RESOLUTION = {
+    "anthropic/": (1568, 0),
+    "google/": (1536, 0),
+    "openai/": (2048, 768),
+}
+_VLM_DEFAULT_MAX_RESOLUTION = (1568, 0)
+
+
+def vlm_max_resolution(model):
+    for prefix, limits in _VLM_MAX_RESOLUTION.items():
+        if model.startswith(prefix):
+            return limits
+    return _VLM_DEFAULT_MAX_RESOLUTION
+
+
+def caption_image(
+    image,
+    prompt,
+    model,
+    system_prompt,
+    reasoning,
+    priority,
+    temperature,
+    max_tokens,
+    cache_mode,
+    downscale_input,
+):
+    """Describe one image with a vision LLM, raising on failure."""
+    limits = vlm_max_resolution(model) if downscale_input else (0, 0)
+    image_fingerprint = None
+    if TextResponseCache.should_cache(cache_mode, temperature):
+        image_fingerprint = "{}:{}x{}".format(
+            TextResponseCache.image_fingerprint(image), *limits
+        )
+
+    arguments = build_llm_arguments(
+        prompt, model, system_prompt, reasoning, priority, temperature, max_tokens
+    )
+
+    # The cache is keyed by image content, so a hit also skips the image upload
+    cache_key = None
+    if image_fingerprint:
+        cache_key = TextResponseCache.make_key(
+            "fal-ai/any-llm/vision", arguments, image_fingerprint
+        )
+        cached = ApiHandler.get_cached_text(cache_key)
+        if cached is not None:
+            return cached
+
+    if downscale_input:
+        image = ImageUtils.downscale_image(image, *limits)
+    image_url = ImageUtils.upload_image(image)
+    if not image_url:
+        raise RuntimeError("Failed to upload image")
+    arguments["image_url"] = image_url
+
+    return ApiHandler.generate_text("fal-ai/any-llm/vision", arguments, cache_key)
 
 
 class VLMNode:
@@ -46,6 +115,9 @@ class VLMNode:
                     "INT",
                     {"default": 1024, "min": 1, "max": 32768, "step": 1},
                 ),
+                # auto caches only deterministic (temperature 0) requests
+                "cache_mode": (TEXT_CACHE_MODES, {"default": "auto"}),
+                "downscale_input": ("BOOLEAN", {"default": True}),
             },
         }
 
@@ -63,46 +135,93 @@ class VLMNode:
         priority="latency",
         temperature=0.7,
         max_tokens=1024,
+        cache_mode="auto",
+        downscale_input=True,
     ):
         try:
-            image_url = ImageUtils.upload_image(image)
-            if not image_url:
-                return ApiHandler.handle_text_generation_error(
-                    model, "Failed to upload image"
-                )
+            return (
+                caption_image(
+                    image,
+                    prompt,
+                    model,
+                    system_prompt,
+                    reasoning,
+                    priority,
+                    temperature,
+                    max_tokens,
+                    cache_mode,
+                    downscale_input,
+                ),
+            )
+        except Exception as e:
+            return ApiHandler.handle_text_generation_error(model, e)
+
 
-            arguments = {
-                "model": model,
-                "prompt": prompt,
-                "system_prompt": system_prompt,
-                "image_url": image_url,
-            }
+class VLMBatchNode:
+    @classmethod
+    def INPUT_TYPES(cls):
+        inputs = VLMNode.INPUT_TYPES()
+        inputs["required"]["max_parallel"] = ("INT", {"default": 8, "min": 1, "max": 64})
+        return inputs
 
-            if reasoning:
-                arguments["reasoning"] = reasoning
+    RETURN_TYPES = ("STRING", "STRING")
+    RETURN_NAMES = ("captions", "captions_text")
+    OUTPUT_IS_LIST = (True, False)
+    FUNCTION = "caption_batch"
+    CATEGORY = "FAL/VLM"
 
-            if priority:
-                arguments["priority"] = priority
+    def caption_batch(
+        self,
+        prompt,
+        model,
+        system_prompt,
+        image,
+        max_parallel,
+        reasoning=False,
+        priority="latency",
+        temperature=0.7,
+        max_tokens=1024,
+        cache_mode="auto",
+        downscale_input=True,
+    ):
+        frames = image if image.ndim == 4 else image.unsqueeze(0)
+        if len(frames) == 0:
+            return ([], "")
 
-            if temperature is not None:
-                arguments["temperature"] = float(temperature)
+        def caption_frame(frame):
+            # Each worker uploads its own frame, so uploads overlap with other frames' requests
+            try:
+                return caption_image(
+                    frame.unsqueeze(0),
+                    prompt,
+                    model,
+                    system_prompt,
+                    reasoning,
+                    priority,
+                    temperature,
+                    max_tokens,
+                    cache_mode,
+                    downscale_input,
+                )
+            except Exception as e:
+                message = e.message if isinstance(e, FalAPIError) else str(e)
+                print(f"Error captioning image with {model}: {message}")
+                return ""
 
-            if max_tokens is not None and max_tokens > 0:
-                arguments["max_tokens"] = int(max_tokens)
+        with ThreadPoolExecutor(max_workers=min(max_parallel, len(frames))) as executor:
+            captions = list(executor.map(caption_frame, frames))
 
-            return ApiHandler.run_text_job(
-                model, "fal-ai/any-llm/vision", arguments
-            )
-        except Exception as e:
-            return ApiHandler.handle_text_generation_error(model, str(e))
+        return (captions, "\n".join(caption.replace("\n", " ") for caption in captions))
 
 
 # Node class mappings
 NODE_CLASS_MAPPINGS = {
     "VLM_fal": VLMNode,
+    "VLMBatch_fal": VLMBatchNode,
 }
 
 # Node display name mappings
 NODE_DISPLAY_NAME_MAPPINGS = {
     "VLM_fal": "VLM (fal)",
+    "VLMBatch_fal": "VLM Batch Caption (fal)",
 }
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+# The node modules are imported as ``nodes.*`` from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StandInStorage:
+    """In-process HTTP server speaking fal's CDN multipart upload protocol."""
+
+    def __init__(self):
+        self.uploads = {}
+        self.files = {}
+        self.part_requests = []
+        self.fail_puts = 0
+        self._lock = threading.Lock()
+        storage = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body=b"", headers=None):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _body(self):
+                return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            def do_POST(self):
+                body = self._body()
+                if self.path == "/files/upload/multipart":
+                    with storage._lock:
+                        upload_id = str(len(storage.uploads) + 1)
+                        storage.uploads[upload_id] = {}
+                    name = self.headers["X-Fal-File-Name"]
+                    payload = {
+                        "access_url": f"{storage.base_url}/files/{upload_id}/{name}",
+                        "uploadId": upload_id,
+                    }
+                    return self._reply(200, json.dumps(payload).encode("utf-8"))
+                if self.path.endswith("/complete"):
+                    upload_id = self.path.split("/")[-2]
+                    parts = storage.uploads[upload_id]
+                    data = b""
+                    for part in json.loads(body)["parts"]:
+                        chunk, etag = parts[part["partNumber"]]
+                        if etag != part["etag"]:
+                            return self._reply(400)
+                        data += chunk
+                    storage.files[upload_id] = data
+                    return self._reply(200)
+                return self._reply(404)
+
+            def do_PUT(self):
+                body = self._body()
+                upload_id, part_number = self.path.split("/")[-2:]
+                with storage._lock:
+                    storage.part_requests.append(int(part_number))
+                    if storage.fail_puts > 0:
+                        storage.fail_puts -= 1
+                        return self._reply(500)
+                if upload_id not in storage.uploads:
+                    return self._reply(404)
+                etag = hashlib.md5(body).hexdigest()
+                storage.uploads[upload_id][int(part_number)] = (body, etag)
+                return self._reply(200, headers={"ETag": etag})
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def content(self, url):
+        if url.startswith("small:"):
+            return self.files[url]
+        return self.files[url.split("/")[-2]]
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class StandInClient:
+    """The parts of fal_client's SyncClient that the upload helpers use."""
+
+    def __init__(self, storage):
+        self._storage = storage
+        self._token_manager = SimpleNamespace(
+            get_token=lambda: SimpleNamespace(
+                token="test", token_type="Bearer", base_upload_url=storage.base_url
+            )
+        )
+
+    def upload(self, data, content_type, file_name=None):
+        url = f"small:{len(self._storage.files)}"
+        self._storage.files[url] = bytes(data)
+        return url
+
+
+@pytest.fixture
+def storage():
+    server = StandInStorage()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def client(storage):
+    return StandInClient(storage)
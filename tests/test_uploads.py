@@ -0,0 +1,166 @@
+import io
+import json
+import os
+import time
+import zipfile
+
+import pytest
+import torch
+
+from nodes import fal_utils, trainer_node
+from nodes.fal_utils import MultipartUploadSession, ResumableFileUpload
+
+CHUNK = 5 * 1024 * 1024
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(fal_utils, "_UPLOAD_PART_RETRIES", 3)
+    monkeypatch.setattr(fal_utils.time, "sleep", lambda seconds: None)
+
+
+@pytest.fixture
+def large_file(tmp_path):
+    data = os.urandom(3 * CHUNK + 1024)
+    path = tmp_path / "large.bin"
+    path.write_bytes(data)
+    return path, data
+
+
+def _upload(client, path, manifest_dir):
+    return ResumableFileUpload(client, path, chunk_size=CHUNK, manifest_dir=manifest_dir)
+
+
+def test_part_server_errors_are_retried(storage, client, large_file, tmp_path):
+    path, data = large_file
+    storage.fail_puts = 2
+
+    url = _upload(client, path, str(tmp_path / "manifests")).upload()
+
+    assert storage.content(url) == data
+    assert len(storage.part_requests) == 4 + 2
+    assert os.listdir(tmp_path / "manifests") == []
+
+
+def test_interrupted_upload_resumes_missing_parts(
+    storage, client, large_file, tmp_path, monkeypatch
+):
+    path, data = large_file
+    manifest_dir = str(tmp_path / "manifests")
+    upload_part = MultipartUploadSession.upload_part
+
+    def interrupted(self, part_number, chunk):
+        if part_number == 3:
+            raise ConnectionError("network down")
+        return upload_part(self, part_number, chunk)
+
+    monkeypatch.setattr(MultipartUploadSession, "upload_part", interrupted)
+    with pytest.raises(ConnectionError):
+        _upload(client, path, manifest_dir).upload()
+    monkeypatch.setattr(MultipartUploadSession, "upload_part", upload_part)
+
+    storage.part_requests.clear()
+    url = _upload(client, path, manifest_dir).upload()
+
+    assert storage.part_requests == [3]
+    assert storage.content(url) == data
+    assert len(storage.uploads) == 1
+
+
+def test_stale_upload_id_restarts_from_scratch(storage, client, large_file, tmp_path):
+    path, data = large_file
+    upload = _upload(client, path, str(tmp_path / "manifests"))
+    os.makedirs(upload.manifest_dir, exist_ok=True)
+    with open(upload.manifest_path, "w", encoding="utf-8") as handle:
+        json.dump(
+            {
+                "access_url": f"{storage.base_url}/files/999/large.bin",
+                "upload_id": "999",
+                "created": time.time(),
+                "etags": {"1": "stale"},
+            },
+            handle,
+        )
+
+    url = upload.upload()
+
+    assert storage.content(url) == data
+    assert sorted(storage.uploads) == ["1"]
+
+
+def test_small_file_uses_single_upload(storage, client, tmp_path):
+    path = tmp_path / "small.bin"
+    path.write_bytes(b"abc")
+
+    url = _upload(client, path, str(tmp_path / "manifests")).upload()
+
+    assert storage.content(url) == b"abc"
+    assert storage.part_requests == []
+
+
+def test_interrupted_archive_upload_only_resends_missing_parts(
+    storage, client, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(fal_utils, "_UPLOAD_MANIFEST_DIR", str(tmp_path / "manifests"))
+    monkeypatch.setattr(fal_utils, "_UPLOAD_CHUNK_BYTES", CHUNK)
+    monkeypatch.setattr(trainer_node.FalConfig, "get_client", lambda self: client)
+    images = torch.rand(4, 1024, 1024, 3)
+    upload_part = MultipartUploadSession.upload_part
+    finished = set()
+
+    def interrupted(self, part_number, chunk):
+        if part_number == 2:
+            raise ConnectionError("network down")
+        etag = upload_part(self, part_number, chunk)
+        finished.add(part_number)
+        return etag
+
+    monkeypatch.setattr(MultipartUploadSession, "upload_part", interrupted)
+    assert trainer_node.upload_image_dataset(images, reuse_uploaded=False) is None
+    monkeypatch.setattr(MultipartUploadSession, "upload_part", upload_part)
+
+    storage.part_requests.clear()
+    url = trainer_node.upload_image_dataset(images, reuse_uploaded=False)
+
+    assert 1 in finished
+    assert 2 in storage.part_requests
+    assert not finished & set(storage.part_requests)
+    assert len(storage.uploads) == 1
+    with zipfile.ZipFile(io.BytesIO(storage.content(url))) as archive:
+        assert archive.testzip() is None
+        assert len(archive.namelist()) == 4
+    assert os.listdir(tmp_path / "manifests") == []
+
+
+def test_forgotten_archive_upload_is_rebuilt_from_scratch(
+    storage, client, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(fal_utils, "_UPLOAD_MANIFEST_DIR", str(tmp_path / "manifests"))
+    monkeypatch.setattr(trainer_node.FalConfig, "get_client", lambda self: client)
+    payload = os.urandom(2 * CHUNK + 1024)
+    manifest = fal_utils.UploadManifest(repr(("dataset", CHUNK, "application/zip")))
+    manifest.save(
+        {
+            "access_url": f"{storage.base_url}/files/999/images.zip",
+            "upload_id": "999",
+            "created": time.time(),
+            "etags": {},
+            "digests": {},
+        }
+    )
+    monkeypatch.setattr(fal_utils, "_UPLOAD_CHUNK_BYTES", CHUNK)
+
+    url = trainer_node.upload_archive(lambda sink: sink.write(payload), "images.zip", "dataset")
+
+    assert storage.content(url) == payload
+    assert sorted(storage.uploads) == ["1"]
+
+
+def test_image_dataset_archive_round_trips(storage, client, tmp_path, monkeypatch):
+    monkeypatch.setattr(fal_utils, "_UPLOAD_MANIFEST_DIR", str(tmp_path / "manifests"))
+    monkeypatch.setattr(trainer_node.FalConfig, "get_client", lambda self: client)
+    images = torch.rand(3, 32, 32, 3)
+
+    url = trainer_node.upload_image_dataset(images, reuse_uploaded=False)
+
+    assert storage.content(url)[:2] == b"PK"